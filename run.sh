@@ -4,11 +4,11 @@
 set -e
 
 echo "=== Fetching Election Data ==="
-uv run --with httpx python src/fetch_election.py
+uv run --with "httpx[http2]" python src/fetch_election.py
 
 echo ""
 echo "=== Fetching Vote62 Candidate Data ==="
-uv run --with httpx python src/fetch_vote62_candidates.py
+uv run --with "httpx[http2]" python src/fetch_vote62_candidates.py
 
 echo ""
 echo "=== Merging Data ==="
@@ -10,29 +10,45 @@ Setup:
     4. Set GOOGLE_API_KEY environment variable or create .env file
 
 Usage:
-    uv run --with google-api-python-client,requests python src/download_drive_api.py
-    uv run --with google-api-python-client,requests python src/download_drive_api.py --province สระบุรี
-    uv run --with google-api-python-client,requests python src/download_drive_api.py --folder 1YFrEvow3-HwkcosJuXNeI82DL1WSrK_S
+    uv run --with "httpx[http2]" python src/download_drive_api.py
+    uv run --with "httpx[http2]" python src/download_drive_api.py --province สระบุรี
+    uv run --with "httpx[http2]" python src/download_drive_api.py --folder 1YFrEvow3-HwkcosJuXNeI82DL1WSrK_S
 """
 
 import json
 import os
+import random
 import re
 import argparse
+import functools
+from collections import deque
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import itertools
 import time
 
 try:
-    import requests
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
+    import httpx
 except ImportError:
-    print(
-        "Run: uv run --with google-api-python-client,requests python src/download_drive_api.py"
-    )
+    print('Run: uv run --with "httpx[http2]" python src/download_drive_api.py')
     exit(1)
 
+# HTTP/2 needs the optional h2 package (httpx[http2]); keep working on
+# HTTP/1.1 keep-alive when only bare httpx is installed
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+
+# Shared thread-safe client. HTTP/2 multiplexes concurrent requests over
+# a handful of TLS connections instead of one socket per in-flight file.
+CLIENT = httpx.Client(
+    http2=h2 is not None,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    timeout=120,
+)
 
 ROOT_DIR = Path(__file__).parent.parent
 DATA_DIR = ROOT_DIR / "data"
@@ -43,20 +59,29 @@ DATA_DIR.mkdir(exist_ok=True)
 
 FOLDER_INDEX_FILE = DATA_DIR / "ect_election_index.json"
 PROGRESS_FILE = DATA_DIR / "download_progress.json"
+JOURNAL_FILE = DATA_DIR / "download_journal.jsonl"
 ENV_FILE = ROOT_DIR / ".env"
 
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+
+# Translation table mapping filesystem-unsafe characters to "_"
+_BAD_FN_CHARS = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
 
+@functools.lru_cache(maxsize=1)
 def get_api_key() -> str:
-    """Get API key from environment or .env file."""
+    """Get API key from environment or .env file (parsed once per process)."""
     api_key = os.environ.get("GOOGLE_API_KEY")
     if api_key:
         return api_key
 
     if ENV_FILE.exists():
         with open(ENV_FILE) as f:
-            for line in f:
-                if line.startswith("GOOGLE_API_KEY="):
-                    return line.split("=", 1)[1].strip().strip("\"'")
+            match = re.search(
+                r'^\s*GOOGLE_API_KEY\s*=\s*["\']?([^"\'\s]+)', f.read(), re.MULTILINE
+            )
+            if match:
+                return match.group(1)
     return ""
 
 
@@ -64,150 +89,228 @@ def load_progress() -> dict:
     if PROGRESS_FILE.exists():
         with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
-            # Migrate old list format to dict format for failed
-            if isinstance(data.get("failed"), list):
-                data["failed"] = {}
-            return data
-    return {"downloaded": [], "failed": {}, "errors": [], "last_updated": None}
+        # Migrate old list format to dict format for failed
+        if isinstance(data.get("failed"), list):
+            data["failed"] = {}
+        # Keep downloaded IDs as a set for O(1) membership checks
+        data["downloaded"] = set(data.get("downloaded", []))
+        data["completed_folders"] = set(data.get("completed_folders", []))
+    else:
+        data = {
+            "downloaded": set(),
+            "completed_folders": set(),
+            "failed": {},
+            "errors": [],
+            "last_updated": None,
+        }
+
+    # Replay per-file events journaled since the last full snapshot
+    if JOURNAL_FILE.exists():
+        with open(JOURNAL_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                rec = json.loads(line)
+                if rec.get("status") == "ok":
+                    data["downloaded"].add(rec["id"])
+                    data["failed"].pop(rec["id"], None)
+                else:
+                    data["failed"][rec["id"]] = {
+                        "path": rec.get("path", ""),
+                        "province": rec.get("province", ""),
+                        "error": rec.get("error", ""),
+                    }
+
+    return data
+
+
+def append_journal(record: dict):
+    """Append one per-file event — O(record) instead of rewriting the snapshot."""
+    with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
 
 
 def save_progress(progress: dict):
     progress["last_updated"] = datetime.now().isoformat()
-    with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+    snapshot = dict(progress)
+    snapshot["downloaded"] = sorted(progress["downloaded"])
+    snapshot["completed_folders"] = sorted(progress["completed_folders"])
+    # Write-to-temp + rename so a crash mid-write never truncates the
+    # progress file: readers see the old state or the new one, never partial
+    tmp_path = PROGRESS_FILE.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, PROGRESS_FILE)
+    # The snapshot now contains everything the journal recorded
+    JOURNAL_FILE.unlink(missing_ok=True)
 
 
 def download_file(file_id: str, output_path: Path, api_key: str) -> tuple[bool, str]:
-    """Download file using direct URL with API key. Retries with exponential backoff on 403/429."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    """Download file using direct URL with API key. Retries with exponential backoff on 403/429.
 
+    Assumes output_path's directory already exists (main pre-creates them).
+    """
     url = f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media&key={api_key}"
+    # Stream into a .part file and rename into place on success, so a
+    # killed run never leaves a truncated PDF that looks complete
+    tmp_path = output_path.with_suffix(output_path.suffix + ".part")
     max_delay = 60  # Max delay in seconds
+    max_retries = 8  # Give up on rate limits after this many attempts
     attempt = 0
 
     while True:
         try:
-            response = requests.get(url, stream=True, timeout=120)
-
-            if response.status_code == 200:
-                with open(output_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-
-                if output_path.exists() and output_path.stat().st_size > 0:
-                    return True, ""
+            with CLIENT.stream("GET", url) as response:
+                if response.status_code == 200:
+                    with open(tmp_path, "wb") as f:
+                        for chunk in response.iter_bytes(chunk_size=262144):
+                            f.write(chunk)
+                        f.flush()
+                        os.fsync(f.fileno())
+
+                    if tmp_path.stat().st_size > 0:
+                        os.replace(tmp_path, output_path)
+                        return True, ""
+                    else:
+                        tmp_path.unlink(missing_ok=True)
+                        return False, "Empty file"
+                elif response.status_code in (403, 429):
+                    # Only quota 403s are retryable; a permission-denied
+                    # 403 never resolves, so fail it fast without tripping
+                    # the submit loop's rate-limit brake
+                    if response.status_code == 403:
+                        body = response.read()
+                        if (b"rateLimitExceeded" not in body
+                                and b"userRateLimitExceeded" not in body):
+                            return False, "HTTP 403"
+                    # Truncated exponential backoff with jitter, honoring
+                    # Retry-After if the server sends one.
+                    if attempt >= max_retries:
+                        return False, f"HTTP {response.status_code} (rate limited)"
+                    retry_after = response.headers.get("Retry-After", "")
+                    if retry_after.isdigit():
+                        wait_time = min(int(retry_after), max_delay)
+                    else:
+                        wait_time = min(2**attempt + random.random(), max_delay)
+                    print(f"({response.status_code}, retry in {wait_time:.0f}s)", end=" ", flush=True)
+                    time.sleep(wait_time)
+                    attempt += 1
+                    continue
+                elif response.status_code == 404:
+                    return False, "Not found"
                 else:
-                    output_path.unlink(missing_ok=True)
-                    return False, "Empty file"
-            elif response.status_code == 403:
-                wait_time = min(2**attempt, max_delay)
-                print(f"(403, retry in {wait_time}s)", end=" ", flush=True)
-                time.sleep(wait_time)
-                attempt += 1
-                continue
-            elif response.status_code == 404:
-                return False, "Not found"
-            elif response.status_code == 429:
-                wait_time = min(2 ** (attempt + 2), max_delay)
-                print(f"(429, retry in {wait_time}s)", end=" ", flush=True)
-                time.sleep(wait_time)
-                attempt += 1
-                continue
-            else:
-                return False, f"HTTP {response.status_code}"
-
-        except requests.Timeout:
-            output_path.unlink(missing_ok=True)
+                    return False, f"HTTP {response.status_code}"
+
+        except httpx.TimeoutException:
+            tmp_path.unlink(missing_ok=True)
             wait_time = min(2**attempt, max_delay)
             print(f"(timeout, retry in {wait_time}s)", end=" ", flush=True)
             time.sleep(wait_time)
             attempt += 1
             continue
         except Exception as e:
-            output_path.unlink(missing_ok=True)
+            tmp_path.unlink(missing_ok=True)
             return False, str(e)[:50]
 
 
-def list_files_batch(service, folder_ids: list, province: str, paths: list) -> tuple[list, list]:
-    """List files from multiple folders using batch HTTP request."""
+def list_folder_children(api_key: str, folder_id: str, province: str, path: str,
+                         downloaded: set) -> tuple[list, list]:
+    """List one folder's children via the files.list endpoint, following pagination."""
     files = []
     subfolders = []  # (folder_id, path) tuples for recursion
-    results_map = {}
+    base_query = f"'{folder_id}' in parents and trashed = false"
+    folder_mime = "application/vnd.google-apps.folder"
+
+    # Query subfolders and files separately: subfolders nearly always fit
+    # one page, so a big leaf folder costs 1 + ceil(files/1000) pages
+    # instead of mixed paging over everything
+    for query in (
+        f"{base_query} and mimeType = '{folder_mime}'",
+        f"{base_query} and mimeType != '{folder_mime}'",
+    ):
+        page_token = None
+        while True:
+            params = {
+                "q": query,
+                "pageSize": 1000,
+                "fields": "nextPageToken,files(id, name, mimeType, size)",
+                "supportsAllDrives": "true",
+                "includeItemsFromAllDrives": "true",
+                "key": api_key,
+            }
+            if page_token:
+                params["pageToken"] = page_token
+
+            try:
+                resp = CLIENT.get(DRIVE_FILES_URL, params=params, timeout=60)
+                resp.raise_for_status()
+                response = resp.json()
+            except Exception as e:
+                print(f"  ✗ List error: {e}", flush=True)
+                break
+
+            for item in response.get("files", []):
+                item_id = item["id"]
+                item_name = item["name"]
+                item_path = f"{path}/{item_name}" if path else item_name
+
+                if item.get("mimeType", "") == folder_mime:
+                    print(f"  📁 {item_path}/", flush=True)
+                    subfolders.append((item_id, item_path))
+                else:
+                    # Filter during listing so already-downloaded files
+                    # never enter the work list
+                    if item_id in downloaded:
+                        continue
+                    files.append({
+                        "id": item_id,
+                        "name": item_name,
+                        "path": item_path,
+                        "province": province,
+                    })
 
-    def callback(request_id, response, exception):
-        if exception:
-            print(f"  ✗ Batch error: {exception}", flush=True)
-        else:
-            results_map[request_id] = response
-
-    batch = service.new_batch_http_request(callback=callback)
-
-    for i, (folder_id, path) in enumerate(zip(folder_ids, paths)):
-        query = f"'{folder_id}' in parents and trashed = false"
-        request = service.files().list(
-            q=query,
-            pageSize=1000,
-            fields="files(id, name, mimeType, size)",
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True,
-        )
-        batch.add(request, request_id=str(i))
-
-    batch.execute()
-
-    # Process results
-    for i, (folder_id, path) in enumerate(zip(folder_ids, paths)):
-        response = results_map.get(str(i), {})
-        items = response.get("files", [])
-
-        for item in items:
-            item_id = item["id"]
-            item_name = item["name"]
-            item_path = f"{path}/{item_name}" if path else item_name
-            mime_type = item.get("mimeType", "")
-
-            if mime_type == "application/vnd.google-apps.folder":
-                print(f"  📁 {item_path}/", flush=True)
-                subfolders.append((item_id, item_path))
-            else:
-                files.append({
-                    "id": item_id,
-                    "name": item_name,
-                    "path": item_path,
-                    "province": province,
-                })
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
 
     return files, subfolders
 
 
-def list_files_recursive(service, folder_id: str, province: str, batch_size: int = 10) -> list:
-    """Recursively list all files using batch HTTP requests."""
+def list_files_recursive(api_key: str, folder_id: str, province: str,
+                         downloaded: set = frozenset()) -> list:
+    """List all files in a folder tree, breadth-first with an explicit queue."""
     all_files = []
-    pending_folders = [(folder_id, "")]
+    pending_folders = deque([(folder_id, "")])
 
     while pending_folders:
-        # Process folders in batches
-        batch = pending_folders[:batch_size]
-        pending_folders = pending_folders[batch_size:]
-
-        folder_ids = [f[0] for f in batch]
-        paths = [f[1] for f in batch]
-
-        files, subfolders = list_files_batch(service, folder_ids, province, paths)
+        fid, path = pending_folders.popleft()
+        files, subfolders = list_folder_children(api_key, fid, province, path, downloaded)
         all_files.extend(files)
         pending_folders.extend(subfolders)
 
     return all_files
 
 
-def download_files(files: list, api_key: str, progress: dict):
-    """Download files sequentially with progress tracking."""
+def scan_existing_files() -> dict:
+    """Walk PDF_DIR once and map relative path -> size on disk."""
+    return {
+        str(p.relative_to(PDF_DIR)): p.stat().st_size
+        for p in PDF_DIR.rglob("*")
+        if p.is_file()
+    }
+
+
+def download_files(files: list, api_key: str, progress: dict, existing: dict, workers: int = 4):
+    """Download files in parallel with progress tracking."""
     if "errors" not in progress:
         progress["errors"] = []
     if "failed" not in progress or not isinstance(progress["failed"], dict):
         progress["failed"] = {}
 
-    downloaded_ids = set(progress.get("downloaded", []))
+    downloaded_ids = progress["downloaded"]
     stats = {"total": 0, "downloaded": 0, "skipped": 0, "failed": 0}
 
     # Filter files to download
@@ -220,8 +323,7 @@ def download_files(files: list, api_key: str, progress: dict):
             stats["skipped"] += 1
             continue
 
-        output_path = PDF_DIR / f["province"] / f["path"]
-        if output_path.exists() and output_path.stat().st_size > 0:
+        if existing.get(f"{f['province']}/{f['path']}", 0) > 0:
             downloaded_ids.add(file_id)
             stats["skipped"] += 1
             continue
@@ -230,35 +332,68 @@ def download_files(files: list, api_key: str, progress: dict):
 
     print(f"  Files to download: {len(files_to_download)}")
 
-    # Download sequentially
-    for i, f in enumerate(files_to_download, 1):
-        file_id = f["id"]
-        file_path = f["path"]
-        province = f["province"]
-        output_path = PDF_DIR / province / file_path
-
-        print(f"  [{i}/{len(files_to_download)}] {file_path}...", end=" ", flush=True)
-
-        success, error = download_file(file_id, output_path, api_key)
-
-        if success:
-            size_kb = output_path.stat().st_size / 1024
-            print(f"✓ ({size_kb:.1f} KB)")
-            downloaded_ids.add(file_id)
-            stats["downloaded"] += 1
-            if file_id in progress["failed"]:
-                del progress["failed"][file_id]
-        else:
-            print(f"✗ ({error})")
-            progress["failed"][file_id] = {
-                "path": file_path,
-                "province": province,
-                "error": error,
+    def worker(f):
+        output_path = PDF_DIR / f["province"] / f["path"]
+        success, error = download_file(f["id"], output_path, api_key)
+        return f, success, error
+
+    # Download in parallel with a bounded in-flight window so large runs
+    # never materialize one Future per file up front; bookkeeping stays
+    # in this thread
+    done_count = 0
+    rate_limited = False
+    pending = iter(files_to_download)
+    max_inflight = workers * 4
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            inflight = {
+                executor.submit(worker, f)
+                for f in itertools.islice(pending, max_inflight)
             }
-            stats["failed"] += 1
 
-        # Save progress after each file
-        progress["downloaded"] = list(downloaded_ids)
+            while inflight:
+                done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    f, success, error = future.result()
+                    done_count += 1
+                    file_id = f["id"]
+                    file_path = f["path"]
+                    province = f["province"]
+
+                    if success:
+                        output_path = PDF_DIR / province / file_path
+                        size_kb = output_path.stat().st_size / 1024
+                        print(f"  [{done_count}/{len(files_to_download)}] {file_path} ✓ ({size_kb:.1f} KB)")
+                        downloaded_ids.add(file_id)
+                        stats["downloaded"] += 1
+                        progress["failed"].pop(file_id, None)
+                        append_journal({"id": file_id, "status": "ok"})
+                    else:
+                        print(f"  [{done_count}/{len(files_to_download)}] {file_path} ✗ ({error})")
+                        progress["failed"][file_id] = {
+                            "path": file_path,
+                            "province": province,
+                            "error": error,
+                        }
+                        stats["failed"] += 1
+                        append_journal({
+                            "id": file_id,
+                            "status": "failed",
+                            "path": file_path,
+                            "province": province,
+                            "error": error,
+                        })
+                        if not rate_limited and "rate limited" in error:
+                            rate_limited = True
+                            print("  Rate limited — draining in-flight downloads, submitting no new work")
+
+                # Refill the in-flight window unless we hit a rate limit
+                if not rate_limited:
+                    for f in itertools.islice(pending, len(done)):
+                        inflight.add(executor.submit(worker, f))
+    finally:
+        # Always flush the final state (also covers Ctrl-C)
         save_progress(progress)
 
     return stats
@@ -274,13 +409,14 @@ def main():
         "--skip-failed", action="store_true", help="Skip previously failed files"
     )
     parser.add_argument(
-        "--batch-size", type=int, default=10, help="Number of folders to list per batch request (default: 10)"
+        "--workers", type=int, default=4, help="Number of parallel downloads (default: 4)"
     )
     args = parser.parse_args()
 
     if args.reset:
         if PROGRESS_FILE.exists():
             PROGRESS_FILE.unlink()
+        JOURNAL_FILE.unlink(missing_ok=True)
         print("Progress reset.")
         return
 
@@ -346,7 +482,7 @@ def main():
                         or link.get("province_en")
                         or link["id"][:20]
                     )
-                    province_name = re.sub(r'[<>:"/\\|?*]', "_", province_name)
+                    province_name = province_name.translate(_BAD_FN_CHARS)
 
                     if (
                         args.province
@@ -360,15 +496,12 @@ def main():
         print("No folders to download!")
         return
 
-    # Build Drive service
-    service = build("drive", "v3", developerKey=api_key)
-
     print("=" * 60)
     print("Google Drive Folder Downloader (API)")
     print("=" * 60)
     print(f"Folders: {len(folders)}")
     print(f"Already downloaded: {len(progress.get('downloaded', []))}")
-    print(f"List batch size: {args.batch_size}")
+    print(f"Download workers: {args.workers}")
     if args.skip_failed:
         print(f"Skipping failed: {len(progress.get('failed', {}))}")
     print(f"Output: {PDF_DIR}")
@@ -376,34 +509,77 @@ def main():
 
     total_stats = {"total": 0, "downloaded": 0, "skipped": 0, "failed": 0}
 
+    # One directory walk up front instead of two stat() calls per file
+    existing_files = scan_existing_files()
+
+    # Short-circuit folders that finished in a previous run
+    folders_to_list = [f for f in folders if f["id"] not in progress["completed_folders"]]
+    if len(folders_to_list) < len(folders):
+        print(f"Skipping {len(folders) - len(folders_to_list)} folders already complete")
+
+    if not folders_to_list:
+        print("All folders already downloaded!")
+        return
+
+    def list_folder(folder):
+        files = list_files_recursive(
+            api_key, folder["id"], folder["province"], progress["downloaded"]
+        )
+        return folder, files
+
+    # Phase 1: list all folders in parallel (pure I/O, one thread each)
+    print(f"\nListing {len(folders_to_list)} folders...")
+    listed = []
     try:
-        for i, folder in enumerate(folders, 1):
+        with ThreadPoolExecutor(max_workers=min(8, len(folders_to_list))) as ex:
+            for folder, files in ex.map(list_folder, folders_to_list):
+                print(f"  {folder['province']}: {len(files)} files pending")
+                if files:
+                    listed.append((folder, files))
+                else:
+                    progress["completed_folders"].add(folder["id"])
+        save_progress(progress)
+    except KeyboardInterrupt:
+        print("\n\nInterrupted during listing! Progress saved.")
+        save_progress(progress)
+        return
+
+    # Pre-create every output directory once, instead of one mkdir
+    # syscall per downloaded file
+    out_dirs = {
+        (PDF_DIR / f["province"] / f["path"]).parent
+        for _, files in listed
+        for f in files
+    }
+    for d in out_dirs:
+        d.mkdir(parents=True, exist_ok=True)
+
+    # Phase 2: download
+    try:
+        for i, (folder, files) in enumerate(listed, 1):
             folder_id = folder["id"]
             province = folder["province"]
 
-            print(f"\n[{i}/{len(folders)}] {province}")
+            print(f"\n[{i}/{len(listed)}] {province}")
             print(f"Folder: {folder_id}")
 
-            # List all files using batch HTTP requests
-            files = list_files_recursive(service, folder_id, province, args.batch_size)
-            print(f"  Found {len(files)} files")
-
-            if not files:
-                continue
-
             # Filter out failed if skip_failed
             if args.skip_failed:
                 failed_ids = set(progress.get("failed", {}).keys())
                 files = [f for f in files if f["id"] not in failed_ids]
 
             # Download files
-            stats = download_files(files, api_key, progress)
+            stats = download_files(files, api_key, progress, existing_files, args.workers)
 
             total_stats["total"] += stats["total"]
             total_stats["downloaded"] += stats["downloaded"]
             total_stats["skipped"] += stats["skipped"]
             total_stats["failed"] += stats["failed"]
 
+            if stats["failed"] == 0:
+                progress["completed_folders"].add(folder_id)
+                save_progress(progress)
+
     except KeyboardInterrupt:
         print("\n\nInterrupted! Progress saved.")
     except Exception as e:
@@ -12,10 +12,22 @@ First time setup:
     uv run --with playwright python -m playwright install chromium
 """
 
+import functools
 import json
+import logging
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson serializes in C (~5-10x faster than json for a big index);
+# fall back to the stdlib encoder when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from pathlib import Path
 from datetime import datetime
+from html import unescape
 from urllib.parse import unquote
 
 # Paths
@@ -28,6 +40,8 @@ INDEX_FILE = DATA_DIR / "ect_election_index.json"
 # Target URL
 ECT_ELECTION_URL = "https://www.ect.go.th/ect_th/th/election-2026"
 
+logger = logging.getLogger(__name__)
+
 
 # Province name mapping (Thai to English slug for folder names)
 PROVINCE_SLUGS = {
@@ -112,8 +126,53 @@ PROVINCE_SLUGS = {
     "อุบลราชธานี": "ubonratchathani",
 }
 
+# Longest names first, so the fallback scan's prefix buckets try
+# specific names (พระนครศรีอยุธยา) before shorter aliases (อยุธยา); tuple
+# iteration is also cheaper than dict.items. The automaton path ignores
+# insertion order - its match order is resolved at query time
+_PROVINCES_BY_LEN = tuple(sorted(PROVINCE_SLUGS.items(), key=lambda kv: -len(kv[0])))
+
+# Pure-stdlib fallback index: provinces bucketed by their first two
+# characters, so a substring probe scans the few provinces sharing a
+# 2-char window with the text instead of all 77
+_PROV_BY_PREFIX: dict[str, list[tuple[str, str]]] = {}
+for _th, _en in _PROVINCES_BY_LEN:
+    _PROV_BY_PREFIX.setdefault(_th[:2], []).append((_th, _en))
+
+# Optional Aho-Corasick automaton for the province substring fallback:
+# one linear pass over the text instead of 77 `in` probes per call.
+# Falls back to the plain scan when the package is not installed.
+try:
+    import ahocorasick
+    import hashlib
+    import pickle
+
+    # make_automaton() is paid on every run otherwise; cache the built
+    # automaton on disk, keyed by a hash of the province table so edits
+    # to PROVINCE_SLUGS invalidate stale caches
+    _ac_key = hashlib.md5(
+        repr(sorted(PROVINCE_SLUGS.items())).encode()
+    ).hexdigest()[:12]
+    _AC_CACHE = DATA_DIR / f".province_automaton.{_ac_key}.pkl"
+    try:
+        with open(_AC_CACHE, "rb") as _f:
+            _PROVINCE_AUTOMATON = pickle.load(_f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        _PROVINCE_AUTOMATON = ahocorasick.Automaton()
+        for _th, _en in _PROVINCES_BY_LEN:
+            _PROVINCE_AUTOMATON.add_word(_th, (_th, _en))
+        _PROVINCE_AUTOMATON.make_automaton()
+        try:
+            with open(_AC_CACHE, "wb") as _f:
+                pickle.dump(_PROVINCE_AUTOMATON, _f)
+        except OSError:
+            pass  # cache is best-effort
+except ImportError:
+    _PROVINCE_AUTOMATON = None
+
+
 # Regions to skip (not provinces)
-REGIONS = {
+REGIONS = frozenset({
     "ภาคเหนือ",
     "ภาคกลาง",
     "ภาคตะวันออกเฉียงเหนือ",
@@ -121,25 +180,39 @@ REGIONS = {
     "ภาคตะวันออก",
     "ภาคตะวันตก",
     "ภาคใต้",
-}
+})
+
+# Matches "ภาค..." followed by any region keyword in one scan
+_REGION_RE = re.compile("ภาค.*(เหนือ|กลาง|ใต้|ออก|ตก|อีสาน)")
+
 
+# Matches either Drive URL form in one scan; exactly one group is set
+_DRIVE_RE = re.compile(
+    r"/(?:folders/(?P<folder>[A-Za-z0-9_-]+)|file/d/(?P<file>[A-Za-z0-9_-]+))"
+)
 
+# Precompiled patterns for extract_label_from_img's hot loop
+_HAS_THAI = re.compile(r"[\u0e00-\u0e7f]").search
+_FILENAME_RE = re.compile(r"^\d+\.(png|jpg|jpeg|gif)$", re.IGNORECASE)
+_TRAILING_NAME_RE = re.compile(r"/([^/]+)\.(png|jpg|jpeg|gif)$", re.IGNORECASE)
+_LEADING_NUM_RE = re.compile(r"^\d+[.\-_]?")
+
+
+@functools.lru_cache(maxsize=4096)
 def is_region(text: str) -> bool:
     """Check if text is a region name (not a province)."""
     text = text.strip()
     if text in REGIONS:
         return True
     # Also check if it contains region keywords
-    if "ภาค" in text and any(
-        r in text for r in ["เหนือ", "กลาง", "ใต้", "ออก", "ตก", "อีสาน"]
-    ):
-        return True
-    return False
+    return _REGION_RE.search(text) is not None
 
 
+@functools.lru_cache(maxsize=4096)
 def extract_province_from_text(text: str) -> tuple[str, str]:
-    print(f"extract_province_from_text: {text}")
     """Extract province name from text. Returns (thai_name, english_slug)."""
+    # debug-level only: stdout writes here dominate wall time on big pages
+    logger.debug("extract_province_from_text: %s", text)
     text = text.strip()
 
     # Skip if it's a region
@@ -150,37 +223,59 @@ def extract_province_from_text(text: str) -> tuple[str, str]:
     if text in PROVINCE_SLUGS:
         return text, PROVINCE_SLUGS[text]
 
-    # Check if any province name is contained in the text
-    for thai_name, slug in PROVINCE_SLUGS.items():
-        if thai_name in text:
-            return thai_name, slug
-
-    return "", ""
+    # Check if any province name is contained in the text. iter() yields
+    # matches by end position, not length, so keep the longest hit to
+    # stay in agreement with the pure-Python scan below
+    if _PROVINCE_AUTOMATON is not None:
+        best_th, best_en = "", ""
+        for _, (thai_name, slug) in _PROVINCE_AUTOMATON.iter(text):
+            if len(thai_name) > len(best_th):
+                best_th, best_en = thai_name, slug
+        return best_th, best_en
+
+    # Each 2-char window of the text selects a small candidate bucket;
+    # keep the longest hit so พระนครศรีอยุธยา still beats อยุธยา
+    best_th, best_en = "", ""
+    checked = set()
+    for i in range(len(text) - 1):
+        for thai_name, slug in _PROV_BY_PREFIX.get(text[i : i + 2], ()):
+            if thai_name in checked:
+                continue
+            checked.add(thai_name)
+            if thai_name in text and len(thai_name) > len(best_th):
+                best_th, best_en = thai_name, slug
+
+    return best_th, best_en
 
 
 def extract_label_from_img(img_src: str) -> tuple[str, str, str]:
     """Extract province/region name from image URL. Returns (label, thai_name, english_slug)."""
-    # Decode URL-encoded Thai text
-    decoded = unquote(img_src)
+    # Split first, decode per segment — avoids unquoting scheme/query
+    # bytes that are never inspected
+    parts = img_src.split("/")
 
     # Extract path components that might contain province names
     # e.g., /รายงานผลคะแนน ภาคเหนือ/1.png
-    parts = decoded.split("/")
+    for raw_part in reversed(parts):
+        part = unquote(raw_part)
 
-    for part in reversed(parts):
         # Skip filename
-        if re.match(r"^\d+\.(png|jpg|jpeg|gif)$", part, re.IGNORECASE):
+        if _FILENAME_RE.match(part):
+            continue
+
+        # No Thai characters -> can't name a province; skip the full matcher
+        if not _HAS_THAI(part):
             continue
 
         thai_name, slug = extract_province_from_text(part)
         if slug:
             return part, thai_name, slug
 
-    # Try to extract from filename
-    match = re.search(r"/([^/]+)\.(png|jpg|jpeg|gif)$", decoded, re.IGNORECASE)
+    # Try to extract from filename (only the last segment can match)
+    match = _TRAILING_NAME_RE.search("/" + unquote(parts[-1]) if parts else "")
     if match:
         name = match.group(1)
-        name = re.sub(r"^\d+[.\-_]?", "", name)  # Remove leading numbers
+        name = _LEADING_NUM_RE.sub("", name)  # Remove leading numbers
         thai_name, slug = extract_province_from_text(name)
         if slug:
             return name, thai_name, slug
@@ -189,8 +284,72 @@ def extract_label_from_img(img_src: str) -> tuple[str, str, str]:
     return "", "", ""
 
 
-def fetch_gdrive_links_playwright():
-    """Fetch Google Drive links using Playwright."""
+# Pull Drive hrefs and Thai span texts out of server-rendered table cells
+_TD_HREF_RE = re.compile(r'href=["\']([^"\']*drive\.google\.com[^"\']*)["\']')
+_TD_SPAN_RE = re.compile(r"<span[^>]*>(.*?)</span>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def fetch_gdrive_links_static():
+    """Fetch Google Drive links from the server-rendered HTML, if present.
+
+    Far cheaper than booting chromium. Returns [] when the links are
+    injected by JavaScript (or the request fails) so the caller can fall
+    back to Playwright.
+    """
+    try:
+        import httpx
+    except ImportError:
+        return []
+
+    print(f"Fetching (static HTML): {ECT_ELECTION_URL}")
+    try:
+        resp = httpx.get(
+            ECT_ELECTION_URL,
+            headers={"User-Agent": "Mozilla/5.0"},
+            timeout=30,
+            follow_redirects=True,
+        )
+        resp.raise_for_status()
+    except Exception as e:
+        print(f"Static fetch failed: {e}")
+        return []
+
+    html = resp.text
+    if "drive.google.com" not in html:
+        return []
+
+    anchor_data = []
+    for cell in html.split("<td")[1:]:
+        cell = cell.split("</td>")[0]
+        hrefs = _TD_HREF_RE.findall(cell)
+        if not hrefs:
+            continue
+        spans = [
+            text
+            for text in (
+                unescape(_TAG_RE.sub("", s)).strip()
+                for s in _TD_SPAN_RE.findall(cell)
+            )
+            if 2 <= len(text) <= 60 and _HAS_THAI(text)
+        ]
+        for href in hrefs:
+            anchor_data.append({"href": unescape(href), "spans": spans})
+
+    if not anchor_data:
+        return []
+
+    print(f"Found {len(anchor_data)} Google Drive links in static HTML")
+    return _build_links(anchor_data)
+
+
+def fetch_gdrive_links_playwright(browser=None):
+    """Fetch Google Drive links using Playwright.
+
+    Pass an already-launched ``browser`` to skip the chromium cold start
+    (worth hundreds of ms per call when fetching several pages); without
+    one, a browser is launched and closed for this call only.
+    """
     try:
         from playwright.sync_api import sync_playwright
     except ImportError:
@@ -201,145 +360,166 @@ def fetch_gdrive_links_playwright():
     print(f"Fetching: {ECT_ELECTION_URL}")
     print("Using Playwright to render JavaScript...")
 
-    links = []
+    if browser is not None:
+        return _scrape_drive_links(browser)
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
         try:
-            page.goto(ECT_ELECTION_URL, wait_until="networkidle", timeout=60000)
-
-            # Wait a bit for any lazy-loaded content
-            page.wait_for_timeout(2000)
-
-            # Find all anchor tags with Google Drive links
-            anchors = page.query_selector_all('a[href*="drive.google.com"]')
-
-            print(f"Found {len(anchors)} Google Drive links")
-
-            seen_ids = set()
-
-            for anchor in anchors:
-                href = anchor.get_attribute("href")
-                if not href:
-                    continue
-
-                # Extract folder ID
-                folder_match = re.search(r"/folders/([a-zA-Z0-9_-]+)", href)
-                file_match = re.search(r"/file/d/([a-zA-Z0-9_-]+)", href)
-
-                item_id = None
-                item_type = None
-
-                if folder_match:
-                    item_id = folder_match.group(1)
-                    item_type = "folder"
-                elif file_match:
-                    item_id = file_match.group(1)
-                    item_type = "file"
-
-                if not item_id or item_id in seen_ids:
-                    continue
-                seen_ids.add(item_id)
-
-                # Find province name from nearby <span> element
-                province_th = ""
-                province_en = ""
-                label = ""
-
-                # Find province name from parent <td> cell
-                # Structure: <td><p><span>Province</span></p><p><a>link</a></p></td>
-                span_texts = page.evaluate(
-                    """(anchor) => {
-                    let td = anchor.closest('td');
-                    if (td) {
-                        const spans = td.querySelectorAll('span');
-                        const texts = [];
-                        for (const span of spans) {
-                            const text = span.innerText;
-                            // Only include short Thai text (likely province names)
-                            if (text && text.length >= 2 && text.length <= 60) {
-                                if (/[\u0e00-\u0e7f]/.test(text)) {
-                                    texts.push(text);
-                                }
-                            }
-                        }
-                        return texts;
-                    }
-                    return [];
-                }""",
-                    anchor,
-                )
-
-                # Find first valid province from span texts (skip regions)
-                for text in span_texts:
-                    if is_region(text):
-                        continue
-                    th, en = extract_province_from_text(text)
-                    if en:
-                        province_th = th
-                        province_en = en
-                        label = text
-                        break
-
-                url = (
-                    f"https://drive.google.com/drive/folders/{item_id}"
-                    if item_type == "folder"
-                    else f"https://drive.google.com/file/d/{item_id}"
-                )
-
-                links.append(
-                    {
-                        "type": item_type,
-                        "id": item_id,
-                        "url": url,
-                        "label": label,
-                        "province_th": province_th,
-                        "province_en": province_en,
-                    }
-                )
-
-                display_name = province_en or province_th or label or "unknown"
-                print(
-                    f"  - {item_type.capitalize()}: {item_id[:15]}... -> {display_name}"
-                )
-
-        except Exception as e:
-            print(f"Error: {e}")
-            import traceback
-
-            traceback.print_exc()
-
+            return _scrape_drive_links(browser)
         finally:
             browser.close()
 
+
+def _scrape_drive_links(browser):
+    """Scrape Drive links from the ECT page using an open browser."""
+    links = []
+    page = browser.new_page()
+
+    try:
+        # Drop images/fonts/media/styles — only anchors and spans are
+        # read, so those bytes just slow the load down
+        page.route(
+            "**/*",
+            lambda route: route.abort()
+            if route.request.resource_type in {"image", "media", "font", "stylesheet"}
+            else route.continue_(),
+        )
+
+        # domcontentloaded + a targeted wait for the anchors we need
+        # beats networkidle, which fires late (or never) on busy pages
+        page.goto(ECT_ELECTION_URL, wait_until="domcontentloaded", timeout=60000)
+        try:
+            page.wait_for_selector('a[href*="drive.google.com"]', timeout=30000)
+        except Exception:
+            print("No Drive links appeared within 30s; parsing anyway...")
+
+        # One evaluate returns every Drive anchor plus its <td>'s
+        # candidate span texts — a single browser round-trip instead
+        # of one per anchor
+        anchor_data = page.eval_on_selector_all(
+            'a[href*="drive.google.com"]',
+            """els => els.map(a => {
+                const td = a.closest('td');
+                const spans = td
+                    ? Array.from(td.querySelectorAll('span'))
+                        .map(s => s.innerText)
+                        .filter(t => t && t.length >= 2 && t.length <= 60
+                                  && /[\u0e00-\u0e7f]/.test(t))
+                    : [];
+                return {href: a.getAttribute('href'), spans};
+            })"""
+        )
+
+        print(f"Found {len(anchor_data)} Google Drive links")
+
+        links = _build_links(anchor_data)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+
+        traceback.print_exc()
+
+    finally:
+        page.close()
+
     return links
 
 
+def _resolve_spans(span_texts: list) -> tuple[str, str, str]:
+    """Pick the first span naming a province. Returns (label, thai, slug)."""
+    # Skip regions; dedup first — a <td> often repeats the same label
+    for text in dict.fromkeys(span_texts):
+        if is_region(text):
+            continue
+        th, en = extract_province_from_text(text)
+        if en:
+            return text, th, en
+    return "", "", ""
+
+
+def _build_links(anchor_data: list) -> list:
+    """Resolve raw {href, spans} anchor records into link index entries."""
+    # One dict keyed by item id doubles as the dedup index and the
+    # output order (insertion-ordered)
+    links_by_id: dict[str, dict] = {}
+
+    # Resolve province names for all anchors up front in a thread pool;
+    # the matchers share the lru_cache, so repeated labels are free
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        resolved = list(ex.map(_resolve_spans, (e["spans"] for e in anchor_data)))
+
+    for entry, (label, province_th, province_en) in zip(anchor_data, resolved):
+        href = entry["href"]
+        if not href:
+            continue
+
+        # Extract folder/file ID in a single scan
+        match = _DRIVE_RE.search(href)
+        if not match:
+            continue
+
+        item_id = match.group("folder") or match.group("file")
+        item_type = "folder" if match.group("folder") else "file"
+
+        if item_id in links_by_id:
+            continue
+
+        url = (
+            f"https://drive.google.com/drive/folders/{item_id}"
+            if item_type == "folder"
+            else f"https://drive.google.com/file/d/{item_id}"
+        )
+
+        links_by_id[item_id] = {
+            "type": item_type,
+            "id": item_id,
+            "url": url,
+            "label": label,
+            "province_th": province_th,
+            "province_en": province_en,
+        }
+
+        display_name = province_en or province_th or label or "unknown"
+        print(
+            f"  - {item_type.capitalize()}: {item_id[:15]}... -> {display_name}"
+        )
+
+    return list(links_by_id.values())
+
+
 def main():
     print("=" * 60)
     print("ECT Election Index Fetcher")
     print("=" * 60)
 
-    links = fetch_gdrive_links_playwright()
+    # Try the server-rendered HTML first (no browser boot); fall back to
+    # Playwright when the links only appear after JS runs
+    links = fetch_gdrive_links_static()
+    if not links:
+        links = fetch_gdrive_links_playwright()
 
     if not links:
         print("\nNo Google Drive links found!")
         return
 
-    # Create index
+    # Create index (count folders/files in one pass over links)
+    counts = Counter(l["type"] for l in links)
     index = {
         "fetched_at": datetime.now().isoformat(),
         "source": ECT_ELECTION_URL,
-        "total_folders": len([l for l in links if l["type"] == "folder"]),
-        "total_files": len([l for l in links if l["type"] == "file"]),
+        "total_folders": counts.get("folder", 0),
+        "total_files": counts.get("file", 0),
         "links": links,
     }
 
-    # Save index
-    with open(INDEX_FILE, "w", encoding="utf-8") as f:
-        json.dump(index, f, ensure_ascii=False, indent=2)
+    # Save index (orjson writes UTF-8 directly, no intermediate str)
+    if orjson is not None:
+        INDEX_FILE.write_bytes(orjson.dumps(index, option=orjson.OPT_INDENT_2))
+    else:
+        with open(INDEX_FILE, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
 
     print(f"\n{'=' * 60}")
     print(f"Index saved: {INDEX_FILE}")
@@ -5,12 +5,43 @@ Fetches election results from https://ectreport69.ect.go.th/
 Includes detailed constituency-level data with candidates, party-list votes, and referendum results.
 """
 
+import asyncio
+import hashlib
+import io
 import json
 import csv
+import shutil
 import httpx
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+# HTTP/2 needs the optional h2 package (httpx[http2]); with a bare
+# httpx install the clients fall back to HTTP/1.1 keep-alive
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+# orjson decodes/encodes in C — the dominant non-network cost here is
+# parsing the multi-MB stats blobs; fall back to the stdlib codec
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow's C++ CSV writer is several times faster than the stdlib csv
+# module on the large details file; stdlib csv remains the fallback
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 # Paths
 ROOT_DIR = Path(__file__).parent.parent
 DATA_DIR = ROOT_DIR / "data"
@@ -34,17 +65,70 @@ ENDPOINTS = {
 }
 
 
-def fetch_data(url: str) -> dict | list | None:
-    """Fetch JSON data from URL."""
+# On-disk conditional-GET cache: bodies and their ETag/Last-Modified
+# validators live under DATA_DIR/.httpcache keyed by URL hash, so an
+# unchanged endpoint costs a 304 instead of a full download and re-parse
+CACHE_DIR = DATA_DIR / ".httpcache"
+
+
+def _cache_paths(url: str) -> tuple[Path, Path]:
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return CACHE_DIR / f"{key}.json", CACHE_DIR / f"{key}.meta"
+
+
+def _cache_load(url: str) -> tuple[bytes | None, dict]:
+    body_path, meta_path = _cache_paths(url)
     try:
-        resp = httpx.get(url, timeout=30)
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return body_path.read_bytes(), meta
+    except (OSError, ValueError):
+        return None, {}
+
+
+def _cache_store(url: str, content: bytes, headers) -> None:
+    CACHE_DIR.mkdir(exist_ok=True)
+    body_path, meta_path = _cache_paths(url)
+    body_path.write_bytes(content)
+    meta = {
+        name: headers.get(name)
+        for name in ("etag", "last-modified")
+        if headers.get(name)
+    }
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+
+async def fetch_data(client: httpx.AsyncClient, url: str) -> dict | list | None:
+    """Fetch JSON data from URL, revalidating the on-disk cache."""
+    cached_body, meta = _cache_load(url)
+    headers = {}
+    if cached_body is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last-modified"):
+            headers["If-Modified-Since"] = meta["last-modified"]
+
+    try:
+        resp = await client.get(url, timeout=30, headers=headers)
+        if resp.status_code == 304 and cached_body is not None:
+            return _loads(cached_body)
         resp.raise_for_status()
-        return resp.json()
+        _cache_store(url, resp.content, resp.headers)
+        return _loads(resp.content)
     except Exception as e:
         print(f"  Error fetching {url}: {e}")
         return None
 
 
+async def _fetch_endpoints() -> dict:
+    """Fetch every endpoint concurrently over a pooled HTTP/2 client."""
+    limits = httpx.Limits(max_keepalive_connections=8)
+    async with httpx.AsyncClient(http2=h2 is not None, limits=limits) as client:
+        results = await asyncio.gather(
+            *(fetch_data(client, url) for url in ENDPOINTS.values())
+        )
+    return dict(zip(ENDPOINTS.keys(), results))
+
+
 def fetch_all_data() -> dict:
     """Fetch all election data from API endpoints."""
     print("Fetching Thailand Election Data...")
@@ -55,9 +139,9 @@ def fetch_all_data() -> dict:
         "source": "https://ectreport69.ect.go.th",
     }
 
-    for name, url in ENDPOINTS.items():
-        print(f"  Fetching {name}...")
-        result = fetch_data(url)
+    # The six endpoints are independent, so fetch them in parallel:
+    # wall time is ~max(latency) instead of the sum
+    for name, result in asyncio.run(_fetch_endpoints()).items():
         if result:
             data[name] = result
             print(f"    ✓ Got {name}")
@@ -67,19 +151,163 @@ def fetch_all_data() -> dict:
     return data
 
 
-def create_constituency_details_csv(data: dict, filename: str = "constituency_details.csv"):
-    """Create CSV with detailed constituency data including candidates and party-list."""
+@dataclass(slots=True)
+class LookupCtx:
+    """Lookup tables shared by the CSV builders and the report."""
 
-    # Build lookup tables
-    parties_info = {int(p["id"]): p for p in data.get("parties", [])}
-    mp_candidates = {c["mp_app_id"]: c for c in data.get("mp_candidates", [])}
-    cons_info = {c["cons_id"]: c for c in data.get("constituencies", [])}
-    prov_info = {p["prov_id"]: p for p in data.get("provinces", {}).get("province", [])}
+    parties: dict
+    mps: dict
+    cons: dict
+    prov: dict
+    ref_by_cons: dict
+    # Precomputed display strings: party_id -> (name, abbr) and
+    # mp_app_id -> name, so the hot row loops do one dict lookup instead
+    # of building fallback f-strings per row
+    party_display: dict
+    mp_name: dict
+    # cons_id -> pre-joined zone string ("" when no zones)
+    zone_str: dict
 
-    stats = data.get("stats_cons", {})
-    rows = []
 
-    for province in stats.get("result_province", []):
+def build_lookup_ctx(data: dict) -> LookupCtx:
+    """Build the shared lookup tables once per dataset.
+
+    Every output builder needs the same four id -> record dicts plus the
+    referendum-by-constituency index; building them here keeps that O(N)
+    work out of each create_* function.
+    """
+    ref_by_cons = {}
+    for province in data.get("stats_referendum", {}).get("result_province", []):
+        for cons in province.get("constituencies", []):
+            ref_by_cons[cons["cons_id"]] = cons
+
+    parties = {int(p["id"]): p for p in data.get("parties", [])}
+    mps = {c["mp_app_id"]: c for c in data.get("mp_candidates", [])}
+    constituencies = data.get("constituencies", [])
+
+    return LookupCtx(
+        parties=parties,
+        mps=mps,
+        cons={c["cons_id"]: c for c in constituencies},
+        prov={p["prov_id"]: p for p in data.get("provinces", {}).get("province", [])},
+        ref_by_cons=ref_by_cons,
+        party_display={
+            pid: (p.get("name") or f"Party {pid}", p.get("abbr", ""))
+            for pid, p in parties.items()
+        },
+        mp_name={
+            mp_id: c.get("mp_app_name") or mp_id
+            for mp_id, c in mps.items()
+        },
+        zone_str={
+            c["cons_id"]: ", ".join(c.get("zone") or ())
+            for c in constituencies
+        },
+    )
+
+
+# Fixed column orders for the CSV outputs; rows are plain tuples in this
+# order, which avoids the per-row dict and dict.copy() that DictWriter needs
+_DETAILS_FIELDS = (
+    "province", "prov_id", "cons_id", "cons_no", "zones", "registered_voters",
+    "cons_turnout", "cons_turnout_pct", "cons_valid", "cons_invalid", "cons_blank",
+    "party_list_turnout", "party_list_turnout_pct", "party_list_valid", "party_list_invalid", "party_list_blank",
+    "type", "rank", "candidate_name", "party_name", "party_abbr", "votes", "vote_pct",
+)
+
+_REFERENDUM_FIELDS = (
+    "province", "prov_id", "cons_id", "cons_no", "zones", "registered_voters",
+    "ref_turnout", "ref_turnout_pct",
+    "ref_valid", "ref_valid_pct", "ref_invalid", "ref_invalid_pct",
+    "yes_votes", "yes_pct", "no_votes", "no_pct", "abstained", "abstained_pct",
+    "counted_stations", "count_pct",
+)
+
+_SUMMARY_FIELDS = (
+    "province", "prov_id", "cons_no", "zones", "registered_voters",
+    "cons_turnout", "cons_turnout_pct", "cons_valid", "cons_invalid", "cons_blank",
+    "winner_name", "winner_party", "winner_votes", "winner_pct",
+    "party_list_turnout", "party_list_turnout_pct", "party_list_valid", "party_list_invalid", "party_list_blank",
+    "top_party_list_party", "top_party_list_votes", "top_party_list_pct",
+    "ref_turnout", "ref_turnout_pct", "ref_valid", "ref_invalid",
+    "ref_yes", "ref_yes_pct", "ref_no", "ref_no_pct", "ref_abstained",
+)
+
+# Report border strings, built once at import time; the report writers
+# reuse them for every box they draw
+_EQ_98 = "═" * 98
+_BAR_98 = "━" * 98
+_DASH_58 = "─" * 58
+_DASH_94 = "─" * 94
+
+
+def _write_csv(filename, fieldnames: tuple, row_iter) -> int:
+    """Write rows to a CSV file and return the row count.
+
+    With pyarrow installed the rows are handed to its C++ CSV writer;
+    otherwise they are streamed through the stdlib csv module, keeping
+    peak memory O(1) in the number of rows. An output with no data rows
+    is not kept (the old list-based code never created the file).
+    """
+    if pa is not None:
+        return _write_csv_arrow(filename, fieldnames, row_iter)
+
+    count = 0
+    # A large binary buffer with a text wrapper on top beats the default
+    # line-buffered text open: rows are encoded in bulk and flushed to
+    # disk in 1 MiB chunks instead of per write.
+    with open(filename, "wb", buffering=1 << 20) as raw:
+        with io.TextIOWrapper(raw, encoding="utf-8", newline="", write_through=False) as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            for row in row_iter:
+                writer.writerow(row)
+                count += 1
+
+    if count:
+        print(f"Saved: {filename} ({count:,} rows)")
+    else:
+        Path(filename).unlink(missing_ok=True)
+    return count
+
+
+def _write_csv_arrow(filename, fieldnames: tuple, row_iter) -> int:
+    """Write rows via pyarrow's native CSV writer.
+
+    The rows are accumulated straight into per-column lists (structure of
+    arrays), so the row tuples stay transient and no list-of-rows copy is
+    kept before the transpose that a pa.table would otherwise need.
+    """
+    cols = [[] for _ in fieldnames]
+    appends = tuple(c.append for c in cols)
+    count = 0
+    for row in row_iter:
+        for append, value in zip(appends, row):
+            append(value)
+        count += 1
+
+    if not count:
+        return 0
+
+    table = pa.table(dict(zip(fieldnames, cols)))
+    pa_csv.write_csv(table, str(filename))
+    print(f"Saved: {filename} ({count:,} rows)")
+    return count
+
+
+def _iter_cons_records(data: dict, ctx: LookupCtx):
+    """Walk stats_cons once, yielding prepared per-constituency records.
+
+    Each record carries the values every output sink needs - province name,
+    constituency number, zone string, registered voters, the stats node and
+    the matching referendum node - computed a single time.
+    """
+    prov_info = ctx.prov
+    cons_info = ctx.cons
+    ref_by_cons = ctx.ref_by_cons
+    zone_str_by_id = ctx.zone_str
+
+    for province in data.get("stats_cons", {}).get("result_province", []):
         prov_id = province["prov_id"]
         prov_name = prov_info.get(prov_id, {}).get("province", prov_id)
 
@@ -87,101 +315,103 @@ def create_constituency_details_csv(data: dict, filename: str = "constituency_de
             cons_id = cons["cons_id"]
             cons_data = cons_info.get(cons_id, {})
             cons_no = cons_data.get("cons_no", 0)
-            zones = cons_data.get("zone", [])
-            zone_str = ", ".join(zones) if zones else ""
-            registered = cons_data.get("registered_vote", 0)
-
             if cons_no == 0:
                 continue
 
-            base_row = {
-                "province": prov_name,
-                "prov_id": prov_id,
-                "cons_id": cons_id,
-                "cons_no": cons_no,
-                "zones": zone_str,
-                "registered_voters": registered or 0,
-                # Constituency MP (แบ่งเขต)
-                "cons_turnout": cons.get("turn_out", 0),
-                "cons_turnout_pct": cons.get("percent_turn_out", 0),
-                "cons_valid": cons.get("valid_votes", 0),
-                "cons_invalid": cons.get("invalid_votes", 0),
-                "cons_blank": cons.get("blank_votes", 0),
-                # Party-list (บัญชีรายชื่อ)
-                "party_list_turnout": cons.get("party_list_turn_out", 0),
-                "party_list_turnout_pct": cons.get("party_list_percent_turn_out", 0),
-                "party_list_valid": cons.get("party_list_valid_votes", 0),
-                "party_list_invalid": cons.get("party_list_invalid_votes", 0),
-                "party_list_blank": cons.get("party_list_blank_votes", 0),
-            }
-
-            # Add candidate results (สส.แบ่งเขต)
-            candidates = cons.get("candidates", [])
-            sorted_candidates = sorted(candidates, key=lambda x: x.get("mp_app_vote", 0), reverse=True)
-
-            for cand in sorted_candidates:
-                mp_id = cand.get("mp_app_id", "")
-                mp_info = mp_candidates.get(mp_id, {})
-                party_id = cand.get("party_id", 0)
-                party_info = parties_info.get(party_id, {})
-
-                row = base_row.copy()
-                row["type"] = "สส.แบ่งเขต"
-                row["rank"] = cand.get("mp_app_rank", 0)
-                row["candidate_name"] = mp_info.get("mp_app_name", mp_id)
-                row["party_name"] = party_info.get("name", f"Party {party_id}")
-                row["party_abbr"] = party_info.get("abbr", "")
-                row["votes"] = cand.get("mp_app_vote", 0)
-                row["vote_pct"] = cand.get("mp_app_vote_percent", 0)
-                rows.append(row)
-
-            # Add party-list results (บัญชีรายชื่อ)
-            party_results = cons.get("result_party", [])
-            sorted_parties = sorted(party_results, key=lambda x: x.get("party_list_vote", 0), reverse=True)
-
-            for i, pr in enumerate(sorted_parties, 1):
-                if pr.get("party_list_vote", 0) == 0:
-                    continue
-
-                party_id = pr.get("party_id", 0)
-                party_info = parties_info.get(party_id, {})
-
-                row = base_row.copy()
-                row["type"] = "บัญชีรายชื่อ"
-                row["rank"] = i
-                row["candidate_name"] = "-"
-                row["party_name"] = party_info.get("name", f"Party {party_id}")
-                row["party_abbr"] = party_info.get("abbr", "")
-                row["votes"] = pr.get("party_list_vote", 0)
-                row["vote_pct"] = pr.get("party_list_vote_percent", 0)
-                rows.append(row)
-
-    if rows:
-        fieldnames = [
-            "province", "prov_id", "cons_id", "cons_no", "zones", "registered_voters",
-            "cons_turnout", "cons_turnout_pct", "cons_valid", "cons_invalid", "cons_blank",
-            "party_list_turnout", "party_list_turnout_pct", "party_list_valid", "party_list_invalid", "party_list_blank",
-            "type", "rank", "candidate_name", "party_name", "party_abbr", "votes", "vote_pct"
-        ]
-
-        with open(filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
-
-        print(f"Saved: {filename} ({len(rows):,} rows)")
-
-    return rows
-
-
-def create_referendum_details_csv(data: dict, filename: str = "referendum_details.csv"):
-    """Create CSV with referendum results per constituency."""
+            yield (
+                prov_id, prov_name, cons_id, cons_no,
+                zone_str_by_id.get(cons_id, ""),
+                cons_data.get("registered_vote", 0),
+                cons,
+                ref_by_cons.get(cons_id, {}),
+            )
+
+
+def _details_rows_for_cons(rec: tuple, ctx: LookupCtx):
+    """Yield the details-CSV rows for one constituency record."""
+    party_display = ctx.party_display
+    mp_name = ctx.mp_name
+    prov_id, prov_name, cons_id, cons_no, zone_str, registered, cons, _ = rec
+
+    # Bind the bound method once; each .get below is then a plain call
+    cons_get = cons.get
+
+    # Shared prefix of every row for this constituency
+    base = (
+        prov_name, prov_id, cons_id, cons_no, zone_str, registered or 0,
+        # Constituency MP (แบ่งเขต)
+        cons_get("turn_out", 0), cons_get("percent_turn_out", 0),
+        cons_get("valid_votes", 0), cons_get("invalid_votes", 0), cons_get("blank_votes", 0),
+        # Party-list (บัญชีรายชื่อ)
+        cons_get("party_list_turn_out", 0), cons_get("party_list_percent_turn_out", 0),
+        cons_get("party_list_valid_votes", 0), cons_get("party_list_invalid_votes", 0),
+        cons_get("party_list_blank_votes", 0),
+    )
+
+    # Add candidate results (สส.แบ่งเขต)
+    candidates = cons_get("candidates", [])
+    sorted_candidates = sorted(candidates, key=lambda x: x.get("mp_app_vote", 0), reverse=True)
+
+    for cand in sorted_candidates:
+        cand_get = cand.get
+        mp_id = cand_get("mp_app_id", "")
+        party_id = cand_get("party_id", 0)
+        # The fallback f-string only allocates on a true miss
+        party_name, party_abbr = party_display.get(party_id) or (f"Party {party_id}", "")
+
+        yield base + (
+            "สส.แบ่งเขต",
+            cand_get("mp_app_rank", 0),
+            mp_name.get(mp_id, mp_id),
+            party_name,
+            party_abbr,
+            cand_get("mp_app_vote", 0),
+            cand_get("mp_app_vote_percent", 0),
+        )
+
+    # Add party-list results (บัญชีรายชื่อ)
+    party_results = cons_get("result_party", [])
+    sorted_parties = sorted(party_results, key=lambda x: x.get("party_list_vote", 0), reverse=True)
+
+    for i, pr in enumerate(sorted_parties, 1):
+        pr_get = pr.get
+        votes = pr_get("party_list_vote", 0)
+        if votes == 0:
+            continue
+
+        party_id = pr_get("party_id", 0)
+        party_name, party_abbr = party_display.get(party_id) or (f"Party {party_id}", "")
+
+        yield base + (
+            "บัญชีรายชื่อ",
+            i,
+            "-",
+            party_name,
+            party_abbr,
+            votes,
+            pr_get("party_list_vote_percent", 0),
+        )
+
+
+def _iter_details_rows(data: dict, ctx: LookupCtx):
+    """Yield constituency-details rows one at a time (no full list in memory)."""
+    for rec in _iter_cons_records(data, ctx):
+        yield from _details_rows_for_cons(rec, ctx)
+
+
+def create_constituency_details_csv(data: dict, ctx: LookupCtx, filename: str = "constituency_details.csv"):
+    """Create CSV with detailed constituency data including candidates and party-list."""
+    return _write_csv(filename, _DETAILS_FIELDS, _iter_details_rows(data, ctx))
+
+
+def _iter_referendum_rows(data: dict, ctx: LookupCtx):
+    """Yield referendum-details rows one at a time."""
 
-    cons_info = {c["cons_id"]: c for c in data.get("constituencies", [])}
-    prov_info = {p["prov_id"]: p for p in data.get("provinces", {}).get("province", [])}
+    cons_info = ctx.cons
+    prov_info = ctx.prov
+    zone_str_by_id = ctx.zone_str
 
     ref_stats = data.get("stats_referendum", {})
-    rows = []
 
     for province in ref_stats.get("result_province", []):
         prov_id = province["prov_id"]
@@ -191,357 +421,450 @@ def create_referendum_details_csv(data: dict, filename: str = "referendum_detail
             cons_id = cons["cons_id"]
             cons_data = cons_info.get(cons_id, {})
             cons_no = cons_data.get("cons_no", 0)
-            zones = cons_data.get("zone", [])
             registered = cons_data.get("registered_vote", 0)
 
             if cons_no == 0:
                 continue
 
             # Get referendum results
-            ref_results = cons.get("referendum_results", {})
+            cons_get = cons.get
+            ref_results = cons_get("referendum_results", {})
             for q_id, result in ref_results.items():
-                row = {
-                    "province": prov_name,
-                    "prov_id": prov_id,
-                    "cons_id": cons_id,
-                    "cons_no": cons_no,
-                    "zones": ", ".join(zones) if zones else "",
-                    "registered_voters": registered or 0,
+                result_get = result.get
+                yield (
+                    prov_name, prov_id, cons_id, cons_no,
+                    zone_str_by_id.get(cons_id, ""),
+                    registered or 0,
                     # Turnout
-                    "ref_turnout": cons.get("referendum_turn_out", 0),
-                    "ref_turnout_pct": round(cons.get("referendum_percent_turn_out", 0), 2),
+                    cons_get("referendum_turn_out", 0),
+                    round(cons_get("referendum_percent_turn_out", 0), 2),
                     # Valid/Invalid
-                    "ref_valid": cons.get("referendum_valid_votes", 0),
-                    "ref_valid_pct": round(cons.get("referendum_percent_valid_votes", 0), 2),
-                    "ref_invalid": cons.get("referendum_invalid_votes", 0),
-                    "ref_invalid_pct": round(cons.get("referendum_percent_invalid_votes", 0), 2),
+                    cons_get("referendum_valid_votes", 0),
+                    round(cons_get("referendum_percent_valid_votes", 0), 2),
+                    cons_get("referendum_invalid_votes", 0),
+                    round(cons_get("referendum_percent_invalid_votes", 0), 2),
                     # Results
-                    "yes_votes": result.get("yes", 0),
-                    "yes_pct": round(result.get("percent_yes", 0), 2),
-                    "no_votes": result.get("no", 0),
-                    "no_pct": round(result.get("percent_no", 0), 2),
-                    "abstained": result.get("abstained", 0),
-                    "abstained_pct": round(result.get("percent_abstained", 0), 2),
+                    result_get("yes", 0),
+                    round(result_get("percent_yes", 0), 2),
+                    result_get("no", 0),
+                    round(result_get("percent_no", 0), 2),
+                    result_get("abstained", 0),
+                    round(result_get("percent_abstained", 0), 2),
                     # Count progress
-                    "counted_stations": cons.get("referendum_counted_vote_stations", 0),
-                    "count_pct": round(cons.get("referendum_percent_count", 0), 2),
-                }
-                rows.append(row)
+                    cons_get("referendum_counted_vote_stations", 0),
+                    round(cons_get("referendum_percent_count", 0), 2),
+                )
 
-    if rows:
-        with open(filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-            writer.writeheader()
-            writer.writerows(rows)
 
-        print(f"Saved: {filename} ({len(rows):,} rows)")
+def create_referendum_details_csv(data: dict, ctx: LookupCtx, filename: str = "referendum_details.csv"):
+    """Create CSV with referendum results per constituency."""
+    return _write_csv(filename, _REFERENDUM_FIELDS, _iter_referendum_rows(data, ctx))
+
+
+def _summary_row_for_cons(rec: tuple, ctx: LookupCtx) -> tuple:
+    """Build the single summary row for one constituency record."""
+    parties_info = ctx.parties
+    mp_candidates = ctx.mps
+    prov_id, prov_name, cons_id, cons_no, zone_str, registered, cons, ref_cons = rec
+
+    cons_get = cons.get
+
+
+    # Get winner: direct scan with early exit instead of a generator
+    candidates = cons_get("candidates", [])
+    winner = None
+    for c in candidates:
+        if c.get("mp_app_rank") == 1:
+            winner = c
+            break
+
+    winner_name = ""
+    winner_party = ""
+    winner_votes = 0
+    winner_pct = 0
+
+    if winner:
+        mp_id = winner.get("mp_app_id", "")
+        mp_info = mp_candidates.get(mp_id, {})
+        party_id = winner.get("party_id", 0)
+        party_info = parties_info.get(party_id, {})
+
+        winner_name = mp_info.get("mp_app_name", mp_id)
+        winner_party = party_info.get("name", "")
+        winner_votes = winner.get("mp_app_vote", 0)
+        winner_pct = winner.get("mp_app_vote_percent", 0)
+
+    # Get top party-list party: one pass, no key-function dispatch
+    party_results = cons_get("result_party", [])
+    top_party_list = {}
+    top_votes = -1
+    for pr in party_results:
+        votes = pr.get("party_list_vote", 0)
+        if votes > top_votes:
+            top_votes = votes
+            top_party_list = pr
+    top_party_id = top_party_list.get("party_id", 0)
+    top_party_info = parties_info.get(top_party_id, {})
+
+    # Get referendum data
+    ref_results = ref_cons.get("referendum_results", {})
+    ref_result = next(iter(ref_results.values()), {}) if ref_results else {}
+
+    ref_cons_get = ref_cons.get
+    ref_result_get = ref_result.get
+    return (
+        prov_name, prov_id, cons_no,
+        zone_str,
+        registered or 0,
+        # สส.แบ่งเขต stats
+        cons_get("turn_out", 0),
+        round(cons_get("percent_turn_out", 0), 2),
+        cons_get("valid_votes", 0),
+        cons_get("invalid_votes", 0),
+        cons_get("blank_votes", 0),
+        # Winner info
+        winner_name, winner_party, winner_votes, round(winner_pct, 2),
+        # บัญชีรายชื่อ stats
+        cons_get("party_list_turn_out", 0),
+        round(cons_get("party_list_percent_turn_out", 0), 2),
+        cons_get("party_list_valid_votes", 0),
+        cons_get("party_list_invalid_votes", 0),
+        cons_get("party_list_blank_votes", 0),
+        top_party_info.get("name", ""),
+        top_party_list.get("party_list_vote", 0),
+        round(top_party_list.get("party_list_vote_percent", 0), 2),
+        # ประชามติ stats
+        ref_cons_get("referendum_turn_out", 0),
+        round(ref_cons_get("referendum_percent_turn_out", 0), 2),
+        ref_cons_get("referendum_valid_votes", 0),
+        ref_cons_get("referendum_invalid_votes", 0),
+        ref_result_get("yes", 0),
+        round(ref_result_get("percent_yes", 0), 2),
+        ref_result_get("no", 0),
+        round(ref_result_get("percent_no", 0), 2),
+        ref_result_get("abstained", 0),
+    )
+
+
+def _iter_summary_rows(data: dict, ctx: LookupCtx):
+    """Yield one summary row per constituency."""
+    for rec in _iter_cons_records(data, ctx):
+        yield _summary_row_for_cons(rec, ctx)
+
+
+def create_constituency_summary_csv(data: dict, ctx: LookupCtx, filename: str = "constituency_summary.csv"):
+    """Create summary CSV with one row per constituency including referendum."""
+    return _write_csv(filename, _SUMMARY_FIELDS, _iter_summary_rows(data, ctx))
 
-    return rows
 
 
-def create_constituency_summary_csv(data: dict, filename: str = "constituency_summary.csv"):
-    """Create summary CSV with one row per constituency including referendum."""
+def _write_report_header(line, data: dict, stats: dict, ref_stats: dict) -> None:
+    """Write the report banner plus the overall election/referendum stats."""
 
-    parties_info = {int(p["id"]): p for p in data.get("parties", [])}
-    mp_candidates = {c["mp_app_id"]: c for c in data.get("mp_candidates", [])}
-    cons_info = {c["cons_id"]: c for c in data.get("constituencies", [])}
-    prov_info = {p["prov_id"]: p for p in data.get("provinces", {}).get("province", [])}
+    # Header
+    line("╔" + _EQ_98 + "╗")
+    line(f"║{'รายงานผลการเลือกตั้ง สส. ทั่วไป และประชามติ 2569':^98}║")
+    line(f"║{'THAILAND GENERAL ELECTION & REFERENDUM RESULTS 2569 BE (2026 CE)':^98}║")
+    line("╠" + _EQ_98 + "╣")
+    s = f"  ข้อมูล ณ: {data.get('fetched_at', 'N/A')}"
+    line(f"║{s:<98}║")
+    s = f"  แหล่งข้อมูล: {data.get('source', 'N/A')}"
+    line(f"║{s:<98}║")
+    line("╚" + _EQ_98 + "╝")
 
-    # Build referendum lookup by cons_id
-    ref_stats = data.get("stats_referendum", {})
-    ref_by_cons = {}
-    for province in ref_stats.get("result_province", []):
-        for cons in province.get("constituencies", []):
-            ref_by_cons[cons["cons_id"]] = cons
+    # Overall Election Statistics
+    line("\n")
+    line("┌" + _DASH_58 + "┐")
+    line(f"│{' สถิติภาพรวม การเลือกตั้ง (Election Statistics)':<58}│")
+    line("├" + _DASH_58 + "┤")
+    s = f"  ผู้มีสิทธิเลือกตั้งทั้งหมด    {stats.get('turn_out', 0) and data.get('provinces', {}).get('total_registered_vote', 0):>15,}"
+    line(f"│{s:<58}│")
+    s = f"  ผู้มาใช้สิทธิ (Turnout)      {stats.get('turn_out', 0):>15,}  ({stats.get('percent_turn_out', 0):>5.2f}%)"
+    line(f"│{s:<58}│")
+    s = f"  บัตรดี (Valid)              {stats.get('valid_votes', 0):>15,}"
+    line(f"│{s:<58}│")
+    s = f"  บัตรเสีย (Invalid)          {stats.get('invalid_votes', 0):>15,}"
+    line(f"│{s:<58}│")
+    s = f"  บัตรไม่เลือกผู้ใด (Blank)    {stats.get('blank_votes', 0):>15,}"
+    line(f"│{s:<58}│")
+    line("└" + _DASH_58 + "┘")
 
-    stats = data.get("stats_cons", {})
-    rows = []
+    # Referendum Overall Statistics
+    if ref_stats:
+        line("\n")
+        line("┌" + _DASH_58 + "┐")
+        line(f"│{' สถิติภาพรวม ประชามติ (Referendum Statistics)':<58}│")
+        line("├" + _DASH_58 + "┤")
+        s = f"  ผู้มาใช้สิทธิ               {ref_stats.get('referendum_turn_out', 0):>15,}  ({ref_stats.get('referendum_percent_turn_out', 0):>5.2f}%)"
+        line(f"│{s:<58}│")
+        s = f"  บัตรดี                     {ref_stats.get('referendum_valid_votes', 0):>15,}"
+        line(f"│{s:<58}│")
+        s = f"  บัตรเสีย                   {ref_stats.get('referendum_invalid_votes', 0):>15,}"
+        line(f"│{s:<58}│")
+        line("├" + _DASH_58 + "┤")
+        line(f"│{'  คำถาม: รัฐธรรมนูญฉบับใหม่':<58}│")
+        line("├" + _DASH_58 + "┤")
 
-    for province in stats.get("result_province", []):
-        prov_id = province["prov_id"]
-        prov_name = prov_info.get(prov_id, {}).get("province", prov_id)
+        ref_results = ref_stats.get("referendum_results", {})
+        for q_id, result in ref_results.items():
+            s = f"  ✓ เห็นชอบ (YES)            {result.get('yes', 0):>15,}  ({result.get('percent_yes', 0):>5.2f}%)"
+            line(f"│{s:<58}│")
+            s = f"  ✗ ไม่เห็นชอบ (NO)          {result.get('no', 0):>15,}  ({result.get('percent_no', 0):>5.2f}%)"
+            line(f"│{s:<58}│")
+            s = f"  ○ ไม่แสดงความเห็น          {result.get('abstained', 0):>15,}  ({result.get('percent_abstained', 0):>5.2f}%)"
+            line(f"│{s:<58}│")
+        line("└" + _DASH_58 + "┘")
 
-        for cons in province.get("constituencies", []):
-            cons_id = cons["cons_id"]
-            cons_data = cons_info.get(cons_id, {})
-            cons_no = cons_data.get("cons_no", 0)
+    # All Constituency Details
+    line("\n")
+    line("╔" + _EQ_98 + "╗")
+    line(f"║{' ข้อมูลรายเขตเลือกตั้ง (Constituency Details) - ทุกเขต':^98}║")
+    line("╚" + _EQ_98 + "╝")
+
+
+def _write_report_cons(line, rec: tuple, ctx: LookupCtx) -> None:
+    """Write the report section for one constituency record."""
+    parties_info = ctx.parties
+    mp_name_by_id = ctx.mp_name
+    party_display_by_id = ctx.party_display
+    prov_id, prov_name, cons_id, cons_no, zone_str, registered, cons, ref_cons = rec
+
+    # Constituency Header
+    line("\n")
+    line("┏" + _BAR_98 + "┓")
+    s = f"  {prov_name} เขต {cons_no}"
+    line(f"┃{s:<98}┃")
+    line("┣" + _BAR_98 + "┫")
+
+    # Zone info (wrap long text)
+    zone_text = zone_str or "-"
+    if len(zone_text) > 90:
+        zone_text = zone_text[:87] + "..."
+    s = f"  พื้นที่: {zone_text}"
+    line(f"┃{s:<98}┃")
+    s = f"  ผู้มีสิทธิเลือกตั้ง: {registered:,}"
+    line(f"┃{s:<98}┃")
+    line("┗" + _BAR_98 + "┛")
+
+    # สส.แบ่งเขต Section
+    line("")
+    line("  ┌" + _DASH_94 + "┐")
+    line(f"  │{' สส.แบ่งเขต (Constituency MP)':<94}│")
+    line("  ├" + _DASH_94 + "┤")
+    s = f"  ผู้มาใช้สิทธิ: {cons.get('turn_out', 0):>10,} ({cons.get('percent_turn_out', 0):>5.2f}%)   │   บัตรดี: {cons.get('valid_votes', 0):>10,}   │   บัตรเสีย: {cons.get('invalid_votes', 0):>8,}   │   ไม่เลือกผู้ใด: {cons.get('blank_votes', 0):>8,}"
+    line(f"  │{s:<94}│")
+    line("  ├" + _DASH_94 + "┤")
+    s = f"  {'ลำดับ':<6} {'ชื่อผู้สมัคร':<40} {'พรรค':<20} {'คะแนน':>12} {'%':>8}    "
+    line(f"  │{s:<94}│")
+    line("  ├" + _DASH_94 + "┤")
+
+    candidates = sorted(cons.get("candidates", []), key=lambda x: x.get("mp_app_rank", 999))
+    for c in candidates:
+        mp_id = c.get("mp_app_id", "")
+        party_id = c.get("party_id", 0)
+        party_info = parties_info.get(party_id, {})
+
+        name = mp_name_by_id.get(mp_id, mp_id)
+        party = party_info.get("name", "")
+        votes = c.get("mp_app_vote", 0)
+        pct = c.get("mp_app_vote_percent", 0)
+        rank = c.get("mp_app_rank", 0)
+        winner = " ★" if rank == 1 else "  "
+
+        # Truncate long names; the slice is a no-op for short strings
+        name_display = name[:38]
+        party_display = party[:18]
+
+        s = f" {winner}{rank:>3}.  {name_display:<40} {party_display:<20} {votes:>12,} {pct:>7.2f}%   "
+        line(f"  │{s:<94}│")
+
+    line("  └" + _DASH_94 + "┘")
+
+    # บัญชีรายชื่อ Section
+    line("")
+    line("  ┌" + _DASH_94 + "┐")
+    line(f"  │{' บัญชีรายชื่อ (Party List)':<94}│")
+    line("  ├" + _DASH_94 + "┤")
+    s = f"  ผู้มาใช้สิทธิ: {cons.get('party_list_turn_out', 0):>10,} ({cons.get('party_list_percent_turn_out', 0):>5.2f}%)   │   บัตรดี: {cons.get('party_list_valid_votes', 0):>10,}   │   บัตรเสีย: {cons.get('party_list_invalid_votes', 0):>8,}   │   ไม่เลือกผู้ใด: {cons.get('party_list_blank_votes', 0):>8,}"
+    line(f"  │{s:<94}│")
+    line("  ├" + _DASH_94 + "┤")
+    s = f"  {'ลำดับ':<6} {'พรรค':<50} {'คะแนน':>15} {'%':>10}       "
+    line(f"  │{s:<94}│")
+    line("  ├" + _DASH_94 + "┤")
+
+    party_results = sorted(cons.get("result_party", []), key=lambda x: x.get("party_list_vote", 0), reverse=True)
+    for i, pr in enumerate(party_results, 1):
+        party_id = pr.get("party_id", 0)
+        party_name = (party_display_by_id.get(party_id) or (f"Party {party_id}", ""))[0]
+        votes = pr.get("party_list_vote", 0)
+        pct = pr.get("party_list_vote_percent", 0)
+
+        if votes == 0:
+            continue  # Skip parties with no votes
+
+        party_display = party_name[:48]
+        s = f"  {i:>4}.  {party_display:<50} {votes:>15,} {pct:>9.2f}%      "
+        line(f"  │{s:<94}│")
+
+    line("  └" + _DASH_94 + "┘")
+
+    # ประชามติ Section
+    line("")
+    line("  ┌" + _DASH_94 + "┐")
+    line(f"  │{' ประชามติ (Referendum)':<94}│")
+    line("  ├" + _DASH_94 + "┤")
+    s = f"  ผู้มาใช้สิทธิ: {ref_cons.get('referendum_turn_out', 0):>10,} ({ref_cons.get('referendum_percent_turn_out', 0):>5.2f}%)   │   บัตรดี: {ref_cons.get('referendum_valid_votes', 0):>10,}   │   บัตรเสีย: {ref_cons.get('referendum_invalid_votes', 0):>8,}"
+    line(f"  │{s:<94}│")
+    line("  ├" + _DASH_94 + "┤")
+
+    ref_results = ref_cons.get("referendum_results", {})
+    for q_id, result in ref_results.items():
+        s = f"  ✓ เห็นชอบ (YES)           {result.get('yes', 0):>12,}    ({result.get('percent_yes', 0):>6.2f}%)"
+        line(f"  │{s:<94}│")
+        s = f"  ✗ ไม่เห็นชอบ (NO)         {result.get('no', 0):>12,}    ({result.get('percent_no', 0):>6.2f}%)"
+        line(f"  │{s:<94}│")
+        s = f"  ○ ไม่แสดงความเห็น         {result.get('abstained', 0):>12,}    ({result.get('percent_abstained', 0):>6.2f}%)"
+        line(f"  │{s:<94}│")
+
+    line("  └" + _DASH_94 + "┘")
+
+
+def _write_report_footer(line) -> None:
+    """Write the closing banner listing the companion data files."""
 
-            if cons_no == 0:
-                continue
+    # Footer
+    line("\n")
+    line("╔" + _EQ_98 + "╗")
+    line(f"║{' จบรายงาน (End of Report)':^98}║")
+    line("╠" + _EQ_98 + "╣")
+    line(f"║{'  ไฟล์ข้อมูลเพิ่มเติม:':<98}║")
+    line(f"║{'    • constituency_details.csv  - ข้อมูลผู้สมัครและคะแนนบัญชีรายชื่อรายเขต':<98}║")
+    line(f"║{'    • constituency_summary.csv  - สรุปรายเขต พร้อมผลประชามติ':<98}║")
+    line(f"║{'    • referendum_details.csv    - ผลประชามติรายเขต':<98}║")
+    line(f"║{'    • election_data.json        - ข้อมูลดิบทั้งหมด':<98}║")
+    line("╚" + _EQ_98 + "╝")
+
+
+def _report_cache_file(data: dict):
+    """Cache path for the rendered report, keyed by a hash of the data.
+
+    fetched_at changes on every run even when the results themselves do
+    not, so it is excluded from the digest; a re-fetch of unchanged
+    results then reuses the previously rendered report verbatim.
+    """
+    payload = {k: v for k, v in data.items() if k != "fetched_at"}
+    try:
+        if orjson is not None:
+            blob = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        else:
+            blob = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    except (TypeError, ValueError):
+        return None
+    digest = hashlib.blake2b(blob, digest_size=16).hexdigest()
+    return REPORTS_DIR / ".report_cache" / f"{digest}.txt"
 
-            zones = cons_data.get("zone", [])
-            registered = cons_data.get("registered_vote", 0)
 
-            # Get winner
-            candidates = cons.get("candidates", [])
-            winner = next((c for c in candidates if c.get("mp_app_rank") == 1), None)
-
-            winner_name = ""
-            winner_party = ""
-            winner_votes = 0
-            winner_pct = 0
-
-            if winner:
-                mp_id = winner.get("mp_app_id", "")
-                mp_info = mp_candidates.get(mp_id, {})
-                party_id = winner.get("party_id", 0)
-                party_info = parties_info.get(party_id, {})
-
-                winner_name = mp_info.get("mp_app_name", mp_id)
-                winner_party = party_info.get("name", "")
-                winner_votes = winner.get("mp_app_vote", 0)
-                winner_pct = winner.get("mp_app_vote_percent", 0)
-
-            # Get top party-list party
-            party_results = cons.get("result_party", [])
-            top_party_list = max(party_results, key=lambda x: x.get("party_list_vote", 0), default={})
-            top_party_id = top_party_list.get("party_id", 0)
-            top_party_info = parties_info.get(top_party_id, {})
-
-            # Get referendum data
-            ref_cons = ref_by_cons.get(cons_id, {})
-            ref_results = ref_cons.get("referendum_results", {})
-            ref_result = next(iter(ref_results.values()), {}) if ref_results else {}
-
-            row = {
-                "province": prov_name,
-                "prov_id": prov_id,
-                "cons_no": cons_no,
-                "zones": ", ".join(zones) if zones else "",
-                "registered_voters": registered or 0,
-                # สส.แบ่งเขต stats
-                "cons_turnout": cons.get("turn_out", 0),
-                "cons_turnout_pct": round(cons.get("percent_turn_out", 0), 2),
-                "cons_valid": cons.get("valid_votes", 0),
-                "cons_invalid": cons.get("invalid_votes", 0),
-                "cons_blank": cons.get("blank_votes", 0),
-                # Winner info
-                "winner_name": winner_name,
-                "winner_party": winner_party,
-                "winner_votes": winner_votes,
-                "winner_pct": round(winner_pct, 2),
-                # บัญชีรายชื่อ stats
-                "party_list_turnout": cons.get("party_list_turn_out", 0),
-                "party_list_turnout_pct": round(cons.get("party_list_percent_turn_out", 0), 2),
-                "party_list_valid": cons.get("party_list_valid_votes", 0),
-                "party_list_invalid": cons.get("party_list_invalid_votes", 0),
-                "party_list_blank": cons.get("party_list_blank_votes", 0),
-                "top_party_list_party": top_party_info.get("name", ""),
-                "top_party_list_votes": top_party_list.get("party_list_vote", 0),
-                "top_party_list_pct": round(top_party_list.get("party_list_vote_percent", 0), 2),
-                # ประชามติ stats
-                "ref_turnout": ref_cons.get("referendum_turn_out", 0),
-                "ref_turnout_pct": round(ref_cons.get("referendum_percent_turn_out", 0), 2),
-                "ref_valid": ref_cons.get("referendum_valid_votes", 0),
-                "ref_invalid": ref_cons.get("referendum_invalid_votes", 0),
-                "ref_yes": ref_result.get("yes", 0),
-                "ref_yes_pct": round(ref_result.get("percent_yes", 0), 2),
-                "ref_no": ref_result.get("no", 0),
-                "ref_no_pct": round(ref_result.get("percent_no", 0), 2),
-                "ref_abstained": ref_result.get("abstained", 0),
-            }
-            rows.append(row)
-
-    if rows:
-        with open(filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-            writer.writeheader()
-            writer.writerows(rows)
-
-        print(f"Saved: {filename} ({len(rows):,} rows)")
-
-    return rows
-
-
-def create_readable_report(data: dict, filename: str = "election_report.txt"):
+def _replay_cached_report(cached: Path, filename, data: dict) -> None:
+    """Copy a cached report, refreshing its fetched_at header line.
+
+    The digest excludes fetched_at, so the cached body is reused but the
+    timestamp must show this run's fetch, matching election_data.json.
+    """
+    lines = cached.read_text(encoding="utf-8").splitlines(keepends=True)
+    s = f"  ข้อมูล ณ: {data.get('fetched_at', 'N/A')}"
+    for i, ln in enumerate(lines[:8]):
+        if ln.startswith("║  ข้อมูล ณ:"):
+            lines[i] = f"║{s:<98}║\n"
+            break
+    Path(filename).write_text("".join(lines), encoding="utf-8")
+
+
+def _store_cached_report(cached: Path, filename) -> None:
+    """Store the freshly rendered report, dropping superseded entries."""
+    cached.parent.mkdir(exist_ok=True)
+    for old in cached.parent.glob("*.txt"):
+        if old != cached:
+            old.unlink(missing_ok=True)
+    shutil.copyfile(filename, cached)
+
+
+def create_readable_report(data: dict, ctx: LookupCtx, filename: str = "election_report.txt"):
     """Create human-readable election report with all constituencies."""
 
-    parties_info = {int(p["id"]): p for p in data.get("parties", [])}
-    mp_candidates = {c["mp_app_id"]: c for c in data.get("mp_candidates", [])}
-    cons_info = {c["cons_id"]: c for c in data.get("constituencies", [])}
-    prov_info = {p["prov_id"]: p for p in data.get("provinces", {}).get("province", [])}
+    cached = _report_cache_file(data)
+    if cached is not None and cached.is_file():
+        _replay_cached_report(cached, filename, data)
+        print(f"Saved: {filename} (cached)")
+        return filename
 
     stats = data.get("stats_cons", {})
     ref_stats = data.get("stats_referendum", {})
 
-    # Build referendum lookup
-    ref_by_cons = {}
-    for province in ref_stats.get("result_province", []):
-        for cons in province.get("constituencies", []):
-            ref_by_cons[cons["cons_id"]] = cons
+    f = open(filename, "w", encoding="utf-8")
+    _write = f.write
 
-    lines = []
+    def line(s: str = "") -> None:
+        _write(s)
+        _write("\n")
 
-    # Header
-    lines.append("╔" + "═" * 98 + "╗")
-    lines.append("║" + "รายงานผลการเลือกตั้ง สส. ทั่วไป และประชามติ 2569".center(98) + "║")
-    lines.append("║" + "THAILAND GENERAL ELECTION & REFERENDUM RESULTS 2569 BE (2026 CE)".center(98) + "║")
-    lines.append("╠" + "═" * 98 + "╣")
-    lines.append("║" + f"  ข้อมูล ณ: {data.get('fetched_at', 'N/A')}".ljust(98) + "║")
-    lines.append("║" + f"  แหล่งข้อมูล: {data.get('source', 'N/A')}".ljust(98) + "║")
-    lines.append("╚" + "═" * 98 + "╝")
+    _write_report_header(line, data, stats, ref_stats)
+    for rec in _iter_cons_records(data, ctx):
+        _write_report_cons(line, rec, ctx)
+    _write_report_footer(line)
 
-    # Overall Election Statistics
-    lines.append("\n")
-    lines.append("┌" + "─" * 58 + "┐")
-    lines.append("│" + " สถิติภาพรวม การเลือกตั้ง (Election Statistics)".ljust(58) + "│")
-    lines.append("├" + "─" * 58 + "┤")
-    lines.append("│" + f"  ผู้มีสิทธิเลือกตั้งทั้งหมด    {stats.get('turn_out', 0) and data.get('provinces', {}).get('total_registered_vote', 0):>15,}".ljust(58) + "│")
-    lines.append("│" + f"  ผู้มาใช้สิทธิ (Turnout)      {stats.get('turn_out', 0):>15,}  ({stats.get('percent_turn_out', 0):>5.2f}%)".ljust(58) + "│")
-    lines.append("│" + f"  บัตรดี (Valid)              {stats.get('valid_votes', 0):>15,}".ljust(58) + "│")
-    lines.append("│" + f"  บัตรเสีย (Invalid)          {stats.get('invalid_votes', 0):>15,}".ljust(58) + "│")
-    lines.append("│" + f"  บัตรไม่เลือกผู้ใด (Blank)    {stats.get('blank_votes', 0):>15,}".ljust(58) + "│")
-    lines.append("└" + "─" * 58 + "┘")
+    f.close()
 
-    # Referendum Overall Statistics
-    if ref_stats:
-        lines.append("\n")
-        lines.append("┌" + "─" * 58 + "┐")
-        lines.append("│" + " สถิติภาพรวม ประชามติ (Referendum Statistics)".ljust(58) + "│")
-        lines.append("├" + "─" * 58 + "┤")
-        lines.append("│" + f"  ผู้มาใช้สิทธิ               {ref_stats.get('referendum_turn_out', 0):>15,}  ({ref_stats.get('referendum_percent_turn_out', 0):>5.2f}%)".ljust(58) + "│")
-        lines.append("│" + f"  บัตรดี                     {ref_stats.get('referendum_valid_votes', 0):>15,}".ljust(58) + "│")
-        lines.append("│" + f"  บัตรเสีย                   {ref_stats.get('referendum_invalid_votes', 0):>15,}".ljust(58) + "│")
-        lines.append("├" + "─" * 58 + "┤")
-        lines.append("│" + "  คำถาม: รัฐธรรมนูญฉบับใหม่".ljust(58) + "│")
-        lines.append("├" + "─" * 58 + "┤")
+    if cached is not None:
+        _store_cached_report(cached, filename)
 
-        ref_results = ref_stats.get("referendum_results", {})
-        for q_id, result in ref_results.items():
-            lines.append("│" + f"  ✓ เห็นชอบ (YES)            {result.get('yes', 0):>15,}  ({result.get('percent_yes', 0):>5.2f}%)".ljust(58) + "│")
-            lines.append("│" + f"  ✗ ไม่เห็นชอบ (NO)          {result.get('no', 0):>15,}  ({result.get('percent_no', 0):>5.2f}%)".ljust(58) + "│")
-            lines.append("│" + f"  ○ ไม่แสดงความเห็น          {result.get('abstained', 0):>15,}  ({result.get('percent_abstained', 0):>5.2f}%)".ljust(58) + "│")
-        lines.append("└" + "─" * 58 + "┘")
+    print(f"Saved: {filename}")
+    return filename
 
-    # All Constituency Details
-    lines.append("\n")
-    lines.append("╔" + "═" * 98 + "╗")
-    lines.append("║" + " ข้อมูลรายเขตเลือกตั้ง (Constituency Details) - ทุกเขต".center(98) + "║")
-    lines.append("╚" + "═" * 98 + "╝")
 
-    for province in stats.get("result_province", []):
-        prov_id = province["prov_id"]
-        prov_name = prov_info.get(prov_id, {}).get("province", prov_id)
+def emit_all(data: dict, ctx: LookupCtx,
+             details_csv="constituency_details.csv",
+             referendum_csv="referendum_details.csv",
+             summary_csv="constituency_summary.csv",
+             report_file="election_report.txt"):
+    """Create all three CSVs and the report from one walk of the stats tree.
 
-        for cons in province.get("constituencies", []):
-            cons_id = cons["cons_id"]
-            cons_data = cons_info.get(cons_id, {})
-            cons_no = cons_data.get("cons_no", 0)
+    _iter_cons_records does the shared per-constituency work (province
+    name, zone string, referendum lookup) exactly once; the prepared
+    records - one small tuple per constituency - are then fanned out to
+    the CSV writers and the report. The referendum CSV reads the separate
+    stats_referendum tree and keeps its own single pass.
+    """
+    records = list(_iter_cons_records(data, ctx))
 
-            if cons_no == 0:
-                continue
+    _write_csv(details_csv, _DETAILS_FIELDS,
+               (row for rec in records for row in _details_rows_for_cons(rec, ctx)))
+    _write_csv(summary_csv, _SUMMARY_FIELDS,
+               (_summary_row_for_cons(rec, ctx) for rec in records))
+    _write_csv(referendum_csv, _REFERENDUM_FIELDS, _iter_referendum_rows(data, ctx))
 
-            zones = cons_data.get("zone", [])
-            ref_cons = ref_by_cons.get(cons_id, {})
-            registered = cons_data.get("registered_vote", 0)
+    cached = _report_cache_file(data)
+    if cached is not None and cached.is_file():
+        _replay_cached_report(cached, report_file, data)
+        print(f"Saved: {report_file} (cached)")
+        return report_file
 
-            # Constituency Header
-            lines.append("\n")
-            lines.append("┏" + "━" * 98 + "┓")
-            lines.append("┃" + f"  {prov_name} เขต {cons_no}".ljust(98) + "┃")
-            lines.append("┣" + "━" * 98 + "┫")
-
-            # Zone info (wrap long text)
-            zone_text = ", ".join(zones) if zones else "-"
-            if len(zone_text) > 90:
-                zone_text = zone_text[:87] + "..."
-            lines.append("┃" + f"  พื้นที่: {zone_text}".ljust(98) + "┃")
-            lines.append("┃" + f"  ผู้มีสิทธิเลือกตั้ง: {registered:,}".ljust(98) + "┃")
-            lines.append("┗" + "━" * 98 + "┛")
-
-            # สส.แบ่งเขต Section
-            lines.append("")
-            lines.append("  ┌" + "─" * 94 + "┐")
-            lines.append("  │" + " สส.แบ่งเขต (Constituency MP)".ljust(94) + "│")
-            lines.append("  ├" + "─" * 94 + "┤")
-            lines.append("  │" + f"  ผู้มาใช้สิทธิ: {cons.get('turn_out', 0):>10,} ({cons.get('percent_turn_out', 0):>5.2f}%)   │   บัตรดี: {cons.get('valid_votes', 0):>10,}   │   บัตรเสีย: {cons.get('invalid_votes', 0):>8,}   │   ไม่เลือกผู้ใด: {cons.get('blank_votes', 0):>8,}".ljust(94) + "│")
-            lines.append("  ├" + "─" * 94 + "┤")
-            lines.append("  │" + f"  {'ลำดับ':<6} {'ชื่อผู้สมัคร':<40} {'พรรค':<20} {'คะแนน':>12} {'%':>8}    ".ljust(94) + "│")
-            lines.append("  ├" + "─" * 94 + "┤")
-
-            candidates = sorted(cons.get("candidates", []), key=lambda x: x.get("mp_app_rank", 999))
-            for c in candidates:
-                mp_id = c.get("mp_app_id", "")
-                mp_info = mp_candidates.get(mp_id, {})
-                party_id = c.get("party_id", 0)
-                party_info = parties_info.get(party_id, {})
-
-                name = mp_info.get("mp_app_name", mp_id)
-                party = party_info.get("name", "")
-                votes = c.get("mp_app_vote", 0)
-                pct = c.get("mp_app_vote_percent", 0)
-                rank = c.get("mp_app_rank", 0)
-                winner = " ★" if rank == 1 else "  "
-
-                # Truncate long names
-                name_display = name[:38] if len(name) > 38 else name
-                party_display = party[:18] if len(party) > 18 else party
-
-                lines.append("  │" + f" {winner}{rank:>3}.  {name_display:<40} {party_display:<20} {votes:>12,} {pct:>7.2f}%   ".ljust(94) + "│")
-
-            lines.append("  └" + "─" * 94 + "┘")
-
-            # บัญชีรายชื่อ Section
-            lines.append("")
-            lines.append("  ┌" + "─" * 94 + "┐")
-            lines.append("  │" + " บัญชีรายชื่อ (Party List)".ljust(94) + "│")
-            lines.append("  ├" + "─" * 94 + "┤")
-            lines.append("  │" + f"  ผู้มาใช้สิทธิ: {cons.get('party_list_turn_out', 0):>10,} ({cons.get('party_list_percent_turn_out', 0):>5.2f}%)   │   บัตรดี: {cons.get('party_list_valid_votes', 0):>10,}   │   บัตรเสีย: {cons.get('party_list_invalid_votes', 0):>8,}   │   ไม่เลือกผู้ใด: {cons.get('party_list_blank_votes', 0):>8,}".ljust(94) + "│")
-            lines.append("  ├" + "─" * 94 + "┤")
-            lines.append("  │" + f"  {'ลำดับ':<6} {'พรรค':<50} {'คะแนน':>15} {'%':>10}       ".ljust(94) + "│")
-            lines.append("  ├" + "─" * 94 + "┤")
-
-            party_results = sorted(cons.get("result_party", []), key=lambda x: x.get("party_list_vote", 0), reverse=True)
-            for i, pr in enumerate(party_results, 1):
-                party_id = pr.get("party_id", 0)
-                party_info = parties_info.get(party_id, {})
-                party_name = party_info.get("name", f"Party {party_id}")
-                votes = pr.get("party_list_vote", 0)
-                pct = pr.get("party_list_vote_percent", 0)
-
-                if votes == 0:
-                    continue  # Skip parties with no votes
-
-                party_display = party_name[:48] if len(party_name) > 48 else party_name
-                lines.append("  │" + f"  {i:>4}.  {party_display:<50} {votes:>15,} {pct:>9.2f}%      ".ljust(94) + "│")
-
-            lines.append("  └" + "─" * 94 + "┘")
-
-            # ประชามติ Section
-            lines.append("")
-            lines.append("  ┌" + "─" * 94 + "┐")
-            lines.append("  │" + " ประชามติ (Referendum)".ljust(94) + "│")
-            lines.append("  ├" + "─" * 94 + "┤")
-            lines.append("  │" + f"  ผู้มาใช้สิทธิ: {ref_cons.get('referendum_turn_out', 0):>10,} ({ref_cons.get('referendum_percent_turn_out', 0):>5.2f}%)   │   บัตรดี: {ref_cons.get('referendum_valid_votes', 0):>10,}   │   บัตรเสีย: {ref_cons.get('referendum_invalid_votes', 0):>8,}".ljust(94) + "│")
-            lines.append("  ├" + "─" * 94 + "┤")
-
-            ref_results = ref_cons.get("referendum_results", {})
-            for q_id, result in ref_results.items():
-                lines.append("  │" + f"  ✓ เห็นชอบ (YES)           {result.get('yes', 0):>12,}    ({result.get('percent_yes', 0):>6.2f}%)".ljust(94) + "│")
-                lines.append("  │" + f"  ✗ ไม่เห็นชอบ (NO)         {result.get('no', 0):>12,}    ({result.get('percent_no', 0):>6.2f}%)".ljust(94) + "│")
-                lines.append("  │" + f"  ○ ไม่แสดงความเห็น         {result.get('abstained', 0):>12,}    ({result.get('percent_abstained', 0):>6.2f}%)".ljust(94) + "│")
+    with open(report_file, "w", encoding="utf-8") as rf:
+        _write = rf.write
 
-            lines.append("  └" + "─" * 94 + "┘")
+        def line(s: str = "") -> None:
+            _write(s)
+            _write("\n")
 
-    # Footer
-    lines.append("\n")
-    lines.append("╔" + "═" * 98 + "╗")
-    lines.append("║" + " จบรายงาน (End of Report)".center(98) + "║")
-    lines.append("╠" + "═" * 98 + "╣")
-    lines.append("║" + "  ไฟล์ข้อมูลเพิ่มเติม:".ljust(98) + "║")
-    lines.append("║" + "    • constituency_details.csv  - ข้อมูลผู้สมัครและคะแนนบัญชีรายชื่อรายเขต".ljust(98) + "║")
-    lines.append("║" + "    • constituency_summary.csv  - สรุปรายเขต พร้อมผลประชามติ".ljust(98) + "║")
-    lines.append("║" + "    • referendum_details.csv    - ผลประชามติรายเขต".ljust(98) + "║")
-    lines.append("║" + "    • election_data.json        - ข้อมูลดิบทั้งหมด".ljust(98) + "║")
-    lines.append("╚" + "═" * 98 + "╝")
-
-    report = "\n".join(lines)
-
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(report)
+        _write_report_header(line, data, data.get("stats_cons", {}), data.get("stats_referendum", {}))
+        for rec in records:
+            _write_report_cons(line, rec, ctx)
+        _write_report_footer(line)
 
-    print(f"Saved: {filename}")
-    return report
+    if cached is not None:
+        _store_cached_report(cached, report_file)
+
+    print(f"Saved: {report_file}")
+    return report_file
 
 
 def main():
@@ -550,19 +873,24 @@ def main():
 
     # Save raw JSON
     json_path = DATA_DIR / "election_data.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        json_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
     print(f"Saved: {json_path}")
 
     print("\nCreating formatted outputs...")
 
-    # Create CSVs
-    create_constituency_details_csv(data, DATA_DIR / "constituency_details.csv")
-    create_referendum_details_csv(data, DATA_DIR / "referendum_details.csv")
-    create_constituency_summary_csv(data, DATA_DIR / "constituency_summary.csv")
-
-    # Create readable report
-    report = create_readable_report(data, REPORTS_DIR / "election_report.txt")
+    # Build the shared lookup tables once, then emit every output in one pass
+    ctx = build_lookup_ctx(data)
+    report_path = emit_all(
+        data, ctx,
+        details_csv=DATA_DIR / "constituency_details.csv",
+        referendum_csv=DATA_DIR / "referendum_details.csv",
+        summary_csv=DATA_DIR / "constituency_summary.csv",
+        report_file=REPORTS_DIR / "election_report.txt",
+    )
 
     print("\n" + "=" * 50)
     print("FETCH COMPLETE!")
@@ -574,8 +902,9 @@ def main():
     print("  - data/constituency_summary.csv  (one row per constituency with all data)")
     print("  - reports/election_report.txt    (human-readable report)")
 
-    # Print report
-    print("\n" + report)
+    # Print report (re-read from disk rather than holding it in memory)
+    print()
+    print(Path(report_path).read_text(encoding="utf-8"))
 
 
 if __name__ == "__main__":
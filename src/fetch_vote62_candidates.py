@@ -8,9 +8,35 @@ from https://www.vote62.com/69/candidates/สส.เขต/
 import json
 import csv
 import httpx
+from collections import defaultdict
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it the
+# shared client sticks to HTTP/1.1 keep-alive instead of failing
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+# orjson encodes the multi-MB raw dump natively, far faster than
+# json.dump; the stdlib encoder is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow formats and encodes CSV output in C++, well ahead of the
+# stdlib csv module on the candidate files; stdlib is the fallback
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_pq
+except ImportError:
+    pa = None
+
 # Paths
 ROOT_DIR = Path(__file__).parent.parent
 DATA_DIR = ROOT_DIR / "data"
@@ -23,15 +49,37 @@ REPORTS_DIR.mkdir(exist_ok=True)
 # Vote62 S3 data source
 DATA_URL = "https://vote62-general-66-site.s3.ap-southeast-1.amazonaws.com/structure_f-69-1.json"
 
+# Shared HTTP client: connection reuse plus HTTP/2 multiplexing (when
+# h2 is installed), so any retry or future second endpoint skips a
+# fresh DNS/TLS handshake
+_CLIENT = httpx.Client(http2=h2 is not None, timeout=30)
+
+# Sort key on the integer ballot number precomputed at extraction time;
+# non-numeric ballot numbers sort last
+_BALLOT_SORT = itemgetter("_ballot_sort")
+_PARTY_SORT = itemgetter("_party_sort")
+
+# Report separators, built once at import instead of per constituency
+_EQ_98 = "═" * 98
+_BAR_98 = "━" * 98
+_DASH_94 = "─" * 94
+_PROV_TOP = "┏" + _BAR_98 + "┓"
+_PROV_BOT = "┗" + _BAR_98 + "┛"
+_CONS_TOP = f"  ┌{_DASH_94}┐"
+_CONS_MID = f"  ├{_DASH_94}┤"
+_CONS_BOT = f"  └{_DASH_94}┘"
+_CONS_HEAD = f"  │ {'เบอร์':<6} {'ชื่อผู้สมัคร':<45} {'พรรค':<40} │"
+
 
 def fetch_vote62_data() -> dict:
     """Fetch candidate data from Vote62 S3 bucket."""
     print("Fetching Vote62 candidate data...")
     print("-" * 50)
 
-    resp = httpx.get(DATA_URL, timeout=30)
+    resp = _CLIENT.get(DATA_URL)
     resp.raise_for_status()
-    data = resp.json()
+    # resp.content is already bytes, which orjson takes directly
+    data = orjson.loads(resp.content) if orjson is not None else resp.json()
 
     print(f"  ✓ Provinces: {len(data.get('provinces', []))}")
     print(f"  ✓ Voting Districts: {len(data.get('votingDistricts', []))}")
@@ -45,30 +93,40 @@ def fetch_vote62_data() -> dict:
 def build_constituency_lookup(data: dict) -> dict:
     """Build lookup from voting district code to province/constituency info."""
     lookup = {}
+    lookup_get = lookup.get
 
     for province in data.get("provinces", []):
         prov_name = province["name"]
 
         for district in province.get("districts", []):
+            district_name = district["name"]
+
             for subdistrict in district.get("subdistricts", []):
+                # Same area string for every voting district below here
+                area = f"{district_name}/{subdistrict['name']}"
+
                 for vd in subdistrict.get("votingDistricts", []):
                     code = vd["code"]
-                    cons_no = vd["name"]
 
-                    if code not in lookup:
-                        lookup[code] = {
+                    entry = lookup_get(code)
+                    if entry is None:
+                        entry = lookup[code] = {
                             "province": prov_name,
-                            "cons_no": cons_no,
+                            "cons_no": vd["name"],
                             "code": code,
                             "areas": []
                         }
-                    lookup[code]["areas"].append(f"{district['name']}/{subdistrict['name']}")
+                    entry["areas"].append(area)
 
     return lookup
 
 
-def extract_constituency_candidates(data: dict) -> list:
-    """Extract สส.เขต candidates with their ballot numbers."""
+def extract_constituency_candidates(data: dict, party_map: dict = None) -> list:
+    """Extract สส.เขต candidates with their ballot numbers.
+
+    party_map (candidate name -> party) fills in entries whose votable
+    record lacks a party, so callers need no second pass over the rows.
+    """
 
     cons_lookup = build_constituency_lookup(data)
     votables = data.get("votables", [])
@@ -78,28 +136,33 @@ def extract_constituency_candidates(data: dict) -> list:
     print(f"\nFound {len(ss_khet)} สส.เขต candidates")
 
     # Group by constituency
-    by_constituency = {}
+    by_constituency = defaultdict(list)
     for v in ss_khet:
         code = v.get("voteingDistrict", "")  # Note: typo in original data
-        if code not in by_constituency:
-            by_constituency[code] = []
-
+        ballot_no = v.get("no", "")
+        candidate_name = v.get("candidate", "")
+        party = v.get("party", "")
+        if not party and party_map:
+            party = party_map.get(candidate_name, "")
         by_constituency[code].append({
-            "ballot_no": v.get("no", ""),
-            "candidate_name": v.get("candidate", ""),
-            "party": v.get("party", "") if "party" in v else "",
-            "resign": v.get("resign", "")
+            "ballot_no": ballot_no,
+            "candidate_name": candidate_name,
+            "party": party,
+            "resign": v.get("resign", ""),
+            "_ballot_sort": int(ballot_no) if ballot_no.isdigit() else 999
         })
 
-    # Build result rows
+    # Build result rows. No sort here: every consumer that cares about
+    # order (the by-constituency CSV, the report) groups and sorts on
+    # its own keys anyway
     rows = []
-    for code, candidates in sorted(by_constituency.items()):
+    for code, candidates in by_constituency.items():
         cons_info = cons_lookup.get(code, {})
         province = cons_info.get("province", code.split(".")[0] if "." in code else code)
         cons_no = cons_info.get("cons_no", code.split(".")[-1] if "." in code else "")
 
         # Sort candidates by ballot number
-        candidates_sorted = sorted(candidates, key=lambda x: int(x["ballot_no"]) if x["ballot_no"].isdigit() else 999)
+        candidates_sorted = sorted(candidates, key=_BALLOT_SORT)
 
         for cand in candidates_sorted:
             rows.append({
@@ -109,7 +172,8 @@ def extract_constituency_candidates(data: dict) -> list:
                 "ballot_no": cand["ballot_no"],
                 "candidate_name": cand["candidate_name"],
                 "party": cand.get("party", ""),
-                "resign": cand.get("resign", "")
+                "resign": cand.get("resign", ""),
+                "_ballot_sort": cand["_ballot_sort"]
             })
 
     return rows
@@ -121,17 +185,29 @@ def get_party_from_candidates(data: dict) -> dict:
     return {c["name"]: c.get("party", "") for c in candidates}
 
 
+def _write_rows_csv(filename, fieldnames: list, rows: list):
+    """Write list-of-dict rows to CSV, via pyarrow's writer when available."""
+    if pa is not None:
+        cols = {k: [r.get(k, "") for r in rows] for k in fieldnames}
+        pa_csv.write_csv(pa.table(cols), str(filename))
+        return
+
+    # csv.writer on plain lists skips DictWriter's per-row dict-to-list
+    # conversion; missing keys in the wide by-constituency rows become ""
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows([r.get(k, "") for k in fieldnames] for r in rows)
+
+
 def save_candidates_csv(rows: list, filename: str = "vote62_candidates.csv"):
     """Save candidates to CSV."""
     if not rows:
         print("No data to save")
         return
 
-    with open(filename, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-        writer.writeheader()
-        writer.writerows(rows)
-
+    fieldnames = [k for k in rows[0] if not k.startswith("_")]
+    _write_rows_csv(filename, fieldnames, rows)
     print(f"Saved: {filename} ({len(rows):,} rows)")
 
 
@@ -142,14 +218,15 @@ def save_candidates_by_constituency_csv(rows: list, filename: str = "vote62_by_c
     by_cons = {}
     for row in rows:
         code = row["cons_code"]
-        if code not in by_cons:
-            by_cons[code] = {
+        entry = by_cons.get(code)
+        if entry is None:
+            entry = by_cons[code] = {
                 "province": row["province"],
                 "cons_no": row["cons_no"],
                 "cons_code": code,
                 "candidates": []
             }
-        by_cons[code]["candidates"].append(row)
+        entry["candidates"].append(row)
 
     # Find max candidates per constituency
     max_candidates = max(len(c["candidates"]) for c in by_cons.values())
@@ -177,103 +254,122 @@ def save_candidates_by_constituency_csv(rows: list, filename: str = "vote62_by_c
         for i in range(1, max_candidates + 1):
             fieldnames.extend([f"no_{i}", f"name_{i}", f"party_{i}"])
 
-        with open(filename, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(flat_rows)
-
+        _write_rows_csv(filename, fieldnames, flat_rows)
         print(f"Saved: {filename} ({len(flat_rows):,} constituencies)")
 
 
+def save_candidates_parquet(rows: list, filename: str = "vote62.parquet"):
+    """Save candidates as columnar Parquet (pyarrow installs only).
+
+    The province and party columns repeat a few dozen Thai strings over
+    thousands of rows, so dictionary encoding plus zstd shrinks the file
+    by an order of magnitude next to the CSV, and downstream columnar
+    readers skip CSV tokenizing entirely.
+    """
+    if pa is None or not rows:
+        return
+
+    fieldnames = [k for k in rows[0] if not k.startswith("_")]
+    cols = {k: [r.get(k, "") for r in rows] for k in fieldnames}
+    pa_pq.write_table(
+        pa.table(cols),
+        str(filename),
+        compression="zstd",
+        use_dictionary=["province", "party"],
+    )
+    print(f"Saved: {filename} ({len(rows):,} rows)")
+
+
 def create_readable_report(rows: list, filename: str = "vote62_candidates_report.txt"):
     """Create human-readable report of candidates by constituency."""
 
-    # Get party mapping
+    # One pass: group by province/constituency and collect the
+    # name -> party fallback map for rows missing a party
     party_map = {}
-    for row in rows:
-        if row["candidate_name"] and row["party"]:
-            party_map[row["candidate_name"]] = row["party"]
-
-    # Group by province then constituency
     by_province = {}
     for row in rows:
         prov = row["province"]
         cons = row["cons_no"]
         key = (prov, cons)
 
-        if key not in by_province:
-            by_province[key] = {
+        entry = by_province.get(key)
+        if entry is None:
+            entry = by_province[key] = {
                 "province": prov,
                 "cons_no": cons,
                 "cons_code": row["cons_code"],
                 "candidates": []
             }
-        by_province[key]["candidates"].append(row)
-
-    lines = []
-    lines.append("╔" + "═" * 98 + "╗")
-    lines.append("║" + "รายชื่อผู้สมัคร สส.เขต ทุกเขตเลือกตั้ง".center(98) + "║")
-    lines.append("║" + "Constituency MP Candidates by Ballot Number".center(98) + "║")
-    lines.append("╠" + "═" * 98 + "╣")
-    lines.append("║" + f"  แหล่งข้อมูล: https://www.vote62.com/69/candidates/สส.เขต/".ljust(98) + "║")
-    lines.append("║" + f"  ดึงข้อมูลเมื่อ: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".ljust(98) + "║")
-    lines.append("║" + f"  จำนวนเขต: {len(by_province)} เขต | จำนวนผู้สมัคร: {len(rows)} คน".ljust(98) + "║")
-    lines.append("╚" + "═" * 98 + "╝")
-
-    current_province = None
-
-    for key in sorted(by_province.keys()):
-        cons_data = by_province[key]
-        prov = cons_data["province"]
-        cons_no = cons_data["cons_no"]
-        candidates = cons_data["candidates"]
-
-        # Province header
-        if prov != current_province:
-            current_province = prov
-            lines.append("\n")
-            lines.append("┏" + "━" * 98 + "┓")
-            lines.append("┃" + f"  จังหวัด: {prov}".ljust(98) + "┃")
-            lines.append("┗" + "━" * 98 + "┛")
-
-        # Constituency
-        lines.append("")
-        lines.append(f"  ┌{'─' * 94}┐")
-        lines.append(f"  │ เขต {cons_no} ({cons_data['cons_code']})".ljust(96) + "│")
-        lines.append(f"  ├{'─' * 94}┤")
-        lines.append(f"  │ {'เบอร์':<6} {'ชื่อผู้สมัคร':<45} {'พรรค':<40} │")
-        lines.append(f"  ├{'─' * 94}┤")
-
-        # Sort by ballot number
-        sorted_cands = sorted(candidates, key=lambda x: int(x["ballot_no"]) if x["ballot_no"].isdigit() else 999)
-
-        for cand in sorted_cands:
-            no = cand["ballot_no"]
-            name = cand["candidate_name"]
-            party = cand.get("party", "") or party_map.get(name, "")
-
-            # Truncate if needed
-            name_display = name[:43] if len(name) > 43 else name
-            party_display = party[:38] if len(party) > 38 else party
-
-            resign = " (ลาออก)" if cand.get("resign") else ""
-            lines.append(f"  │ {no:>4}   {name_display:<45} {party_display:<38}{resign} │")
-
-        lines.append(f"  └{'─' * 94}┘")
-
-    # Footer
-    lines.append("\n")
-    lines.append("╔" + "═" * 98 + "╗")
-    lines.append("║" + " จบรายงาน (End of Report)".center(98) + "║")
-    lines.append("╚" + "═" * 98 + "╝")
-
-    report = "\n".join(lines)
+        entry["candidates"].append(row)
+
+        if row["candidate_name"] and row["party"]:
+            party_map.setdefault(row["candidate_name"], row["party"])
 
     with open(filename, "w", encoding="utf-8") as f:
-        f.write(report)
+        _write = f.write
+
+        def line(s: str = "") -> None:
+            _write(s)
+            _write("\n")
+
+        line("╔" + _EQ_98 + "╗")
+        line("║" + "รายชื่อผู้สมัคร สส.เขต ทุกเขตเลือกตั้ง".center(98) + "║")
+        line("║" + "Constituency MP Candidates by Ballot Number".center(98) + "║")
+        line("╠" + _EQ_98 + "╣")
+        line("║" + f"  แหล่งข้อมูล: https://www.vote62.com/69/candidates/สส.เขต/".ljust(98) + "║")
+        line("║" + f"  ดึงข้อมูลเมื่อ: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".ljust(98) + "║")
+        line("║" + f"  จำนวนเขต: {len(by_province)} เขต | จำนวนผู้สมัคร: {len(rows)} คน".ljust(98) + "║")
+        line("╚" + _EQ_98 + "╝")
+
+        current_province = None
+
+        for key in sorted(by_province.keys()):
+            cons_data = by_province[key]
+            prov = cons_data["province"]
+            cons_no = cons_data["cons_no"]
+            candidates = cons_data["candidates"]
+
+            # Province header
+            if prov != current_province:
+                current_province = prov
+                line("\n")
+                line(_PROV_TOP)
+                line("┃" + f"  จังหวัด: {prov}".ljust(98) + "┃")
+                line(_PROV_BOT)
+
+            # Constituency
+            line()
+            line(_CONS_TOP)
+            line(f"  │ เขต {cons_no} ({cons_data['cons_code']})".ljust(96) + "│")
+            line(_CONS_MID)
+            line(_CONS_HEAD)
+            line(_CONS_MID)
+
+            # Sort by ballot number
+            sorted_cands = sorted(candidates, key=_BALLOT_SORT)
+
+            for cand in sorted_cands:
+                no = cand["ballot_no"]
+                name = cand["candidate_name"]
+                party = cand.get("party", "") or party_map.get(name, "")
+
+                # Truncate if needed
+                name_display = name[:43] if len(name) > 43 else name
+                party_display = party[:38] if len(party) > 38 else party
+
+                resign = " (ลาออก)" if cand.get("resign") else ""
+                line(f"  │ {no:>4}   {name_display:<45} {party_display:<38}{resign} │")
+
+            line(_CONS_BOT)
+
+        # Footer
+        line("\n")
+        line("╔" + _EQ_98 + "╗")
+        line("║" + " จบรายงาน (End of Report)".center(98) + "║")
+        line("╚" + _EQ_98 + "╝")
 
     print(f"Saved: {filename}")
-    return report
+    return filename
 
 
 def extract_party_ballot_numbers(data: dict) -> list:
@@ -286,14 +382,16 @@ def extract_party_ballot_numbers(data: dict) -> list:
 
     rows = []
     for p in party_list:
+        party_no = p.get("no", "")
         rows.append({
-            "party_no": p.get("no", ""),
+            "party_no": party_no,
             "party_name": p.get("party", ""),
-            "resign": p.get("resign", "")
+            "resign": p.get("resign", ""),
+            "_party_sort": int(party_no) if party_no.isdigit() else 999
         })
 
     # Sort by party number
-    rows.sort(key=lambda x: int(x["party_no"]) if x["party_no"].isdigit() else 999)
+    rows.sort(key=_PARTY_SORT)
 
     return rows
 
@@ -304,11 +402,7 @@ def save_party_numbers_csv(rows: list, filename: str = "vote62_party_numbers.csv
         print("No party data to save")
         return
 
-    with open(filename, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["party_no", "party_name", "resign"])
-        writer.writeheader()
-        writer.writerows(rows)
-
+    _write_rows_csv(filename, ["party_no", "party_name", "resign"], rows)
     print(f"Saved: {filename} ({len(rows):,} parties)")
 
 
@@ -323,13 +417,8 @@ def main():
     # Get party mapping from candidates list
     party_map = {c["name"]: c.get("party", "") for c in data.get("candidates", [])}
 
-    # Extract candidates
-    rows = extract_constituency_candidates(data)
-
-    # Add party info from candidates list
-    for row in rows:
-        if not row.get("party") and row["candidate_name"] in party_map:
-            row["party"] = party_map[row["candidate_name"]]
+    # Extract candidates; party_map fills rows missing a party inline
+    rows = extract_constituency_candidates(data, party_map)
 
     print(f"\nProcessed {len(rows):,} candidate entries")
 
@@ -342,19 +431,28 @@ def main():
     save_candidates_csv(rows, DATA_DIR / "vote62_candidates.csv")
     save_candidates_by_constituency_csv(rows, DATA_DIR / "vote62_by_constituency.csv")
     save_party_numbers_csv(party_numbers, DATA_DIR / "vote62_party_numbers.csv")
-    report = create_readable_report(rows, REPORTS_DIR / "vote62_candidates_report.txt")
+    save_candidates_parquet(rows, DATA_DIR / "vote62.parquet")
+    create_readable_report(rows, REPORTS_DIR / "vote62_candidates_report.txt")
 
     # Save raw JSON
     json_path = DATA_DIR / "vote62_data.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "fetched_at": datetime.now().isoformat(),
-            "source": "https://www.vote62.com/69/candidates/สส.เขต/",
-            "data_url": DATA_URL,
-            "candidates": rows,
-            "party_numbers": party_numbers,
-            "raw_data": data
-        }, f, ensure_ascii=False, indent=2)
+    payload = {
+        "fetched_at": datetime.now().isoformat(),
+        "source": "https://www.vote62.com/69/candidates/สส.เขต/",
+        "data_url": DATA_URL,
+        "candidates": [
+            {k: v for k, v in r.items() if not k.startswith("_")} for r in rows
+        ],
+        "party_numbers": [
+            {k: v for k, v in r.items() if not k.startswith("_")} for r in party_numbers
+        ],
+        "raw_data": data
+    }
+    if orjson is not None:
+        json_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
     print(f"Saved: {json_path}")
 
     print("\n" + "=" * 50)
@@ -364,6 +462,8 @@ def main():
     print("  - data/vote62_candidates.csv          (all candidates, one per row)")
     print("  - data/vote62_by_constituency.csv     (one row per constituency)")
     print("  - data/vote62_party_numbers.csv       (party ballot numbers)")
+    if pa is not None:
+        print("  - data/vote62.parquet                 (candidates, columnar)")
     print("  - reports/vote62_candidates_report.txt (human-readable report)")
     print("  - data/vote62_data.json               (complete raw data)")
 
@@ -380,16 +480,15 @@ def main():
     print("SAMPLE: สส.เขต (first 3 constituencies)")
     print("=" * 50)
 
-    # Group for display
-    shown = set()
-    for row in rows:
-        key = (row["province"], row["cons_no"])
-        if key not in shown and len(shown) < 3:
-            shown.add(key)
-            print(f"\n{row['province']} เขต {row['cons_no']}:")
-            same_cons = [r for r in rows if r["province"] == row["province"] and r["cons_no"] == row["cons_no"]]
-            for c in sorted(same_cons, key=lambda x: int(x["ballot_no"]) if x["ballot_no"].isdigit() else 999):
-                print(f"  เบอร์ {c['ballot_no']:>2}: {c['candidate_name']:<35} ({c['party']})")
+    # Group for display: one pass over rows, then show the first 3 keys
+    groups = {}
+    for r in rows:
+        groups.setdefault((r["province"], r["cons_no"]), []).append(r)
+
+    for (province, cons_no), same_cons in islice(groups.items(), 3):
+        print(f"\n{province} เขต {cons_no}:")
+        for c in sorted(same_cons, key=_BALLOT_SORT):
+            print(f"  เบอร์ {c['ballot_no']:>2}: {c['candidate_name']:<35} ({c['party']})")
 
 
 if __name__ == "__main__":
@@ -9,6 +9,14 @@ import csv
 from datetime import datetime
 from pathlib import Path
 
+# Optional: pyarrow moves CSV formatting into native code for the large
+# augmented output; the stdlib csv module is used when it is missing
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
 # Paths
 ROOT_DIR = Path(__file__).parent.parent
 DATA_DIR = ROOT_DIR / "data"
@@ -16,19 +24,50 @@ DATA_DIR = ROOT_DIR / "data"
 
 def load_csv(filename: str) -> list:
     """Load CSV file into list of dicts."""
+    if pa is not None:
+        # Force every column to string so rows come back in the exact
+        # shape DictReader produced (cons_no, ballot numbers, votes all
+        # stay strings instead of being inferred as integers)
+        with open(filename, "r", encoding="utf-8") as f:
+            header = next(csv.reader(f))
+        table = pa_csv.read_csv(
+            str(filename),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={c: pa.string() for c in header}
+            ),
+        )
+        return table.to_pylist()
+
     with open(filename, "r", encoding="utf-8") as f:
         return list(csv.DictReader(f))
 
 
 def save_csv(rows: list, filename: str, fieldnames: list):
     """Save list of dicts to CSV."""
-    with open(filename, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    if pa is not None:
+        cols = {k: [r.get(k, "") for r in rows] for k in fieldnames}
+        pa_csv.write_csv(pa.table(cols), str(filename))
+    else:
+        with open(filename, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows([r.get(k, "") for k in fieldnames] for r in rows)
     print(f"Saved: {filename} ({len(rows):,} rows)")
 
 
+def strip_fields(rows: list, fields: list):
+    """Strip whitespace on the given columns once, in place.
+
+    Done right after load so the lookup-building and merge loops read
+    key fields directly instead of re-stripping them per row.
+    """
+    for row in rows:
+        for k in fields:
+            v = row.get(k)
+            if v:
+                row[k] = v.strip()
+
+
 def normalize_name(name: str) -> str:
     """Normalize name for matching (remove spaces, common prefixes)."""
     if not name:
@@ -55,40 +94,50 @@ def main():
     vote62_candidates = load_csv(DATA_DIR / "vote62_candidates.csv")
     print(f"  ✓ vote62_candidates.csv: {len(vote62_candidates):,} candidates")
 
+    # Normalize the key columns up front
+    strip_fields(constituency_details, ["province", "cons_no", "candidate_name", "party_name"])
+    strip_fields(party_numbers, ["party_name"])
+    strip_fields(vote62_candidates, ["province", "cons_no", "candidate_name", "party"])
+
     # Build lookup tables
     print("\nBuilding lookup tables...")
 
     # Party name -> party ballot number
     party_number_lookup = {}
     for p in party_numbers:
-        party_name = p.get("party_name", "").strip()
+        party_name = p.get("party_name", "")
         party_no = p.get("party_no", "")
         if party_name and party_no:
             party_number_lookup[party_name] = party_no
     print(f"  ✓ Party number lookup: {len(party_number_lookup)} entries")
 
     # (province, cons_no, candidate_name) -> ballot number
-    # Also (province, cons_no, party_name) -> ballot number for matching
+    # Also (province, cons_no, last name token) and
+    # (province, cons_no, party_name) -> ballot number for fuzzy matching
     candidate_ballot_lookup = {}
+    name_tail_lookup = {}
     candidate_by_party_lookup = {}
 
     for c in vote62_candidates:
-        province = c.get("province", "").strip()
-        cons_no = c.get("cons_no", "").strip()
-        candidate_name = c.get("candidate_name", "").strip()
+        province = c.get("province", "")
+        cons_no = c.get("cons_no", "")
+        candidate_name = c.get("candidate_name", "")
         ballot_no = c.get("ballot_no", "")
-        party = c.get("party", "").strip()
+        party = c.get("party", "")
 
         # Primary key: province + cons_no + candidate_name
         key = (province, cons_no, candidate_name)
         candidate_ballot_lookup[key] = ballot_no
 
+        # Last name token, so the common "different title prefix" case
+        # resolves with one dict probe instead of a substring scan
+        if candidate_name:
+            name_tail_lookup[(province, cons_no, candidate_name.split()[-1])] = ballot_no
+
         # Secondary key: province + cons_no + party (for fallback matching)
         key2 = (province, cons_no, party)
-        if key2 not in candidate_by_party_lookup:
-            candidate_by_party_lookup[key2] = []
-        candidate_by_party_lookup[key2].append(
-            {"candidate_name": candidate_name, "ballot_no": ballot_no}
+        candidate_by_party_lookup.setdefault(key2, []).append(
+            (candidate_name, ballot_no)
         )
 
     print(f"  ✓ Candidate ballot lookup: {len(candidate_ballot_lookup)} entries")
@@ -96,22 +145,21 @@ def main():
     # Process and augment constituency_details
     print("\nAugmenting data...")
 
-    augmented_rows = []
+    # The loaded rows are owned by this function, so the two extra
+    # columns are attached in place rather than copying every dict
     matched_party = 0
     matched_candidate = 0
 
     for row in constituency_details:
-        new_row = row.copy()
-
-        province = row.get("province", "").strip()
-        cons_no = row.get("cons_no", "").strip()
-        candidate_name = row.get("candidate_name", "").strip()
-        party_name = row.get("party_name", "").strip()
+        province = row.get("province", "")
+        cons_no = row.get("cons_no", "")
+        candidate_name = row.get("candidate_name", "")
+        party_name = row.get("party_name", "")
         row_type = row.get("type", "")
 
         # Add party ballot number
         party_ballot_no = party_number_lookup.get(party_name, "")
-        new_row["party_ballot_no"] = party_ballot_no
+        row["party_ballot_no"] = party_ballot_no
         if party_ballot_no:
             matched_party += 1
 
@@ -122,29 +170,34 @@ def main():
             key = (province, cons_no, candidate_name)
             candidate_ballot_no = candidate_ballot_lookup.get(key, "")
 
-            # If not found, try fuzzy match by removing title prefixes
+            # Then by last name token (titles differ between sources)
+            if not candidate_ballot_no:
+                candidate_ballot_no = name_tail_lookup.get(
+                    (province, cons_no, candidate_name.split()[-1]), ""
+                )
+
+            # If still not found, try fuzzy match by removing title prefixes
             if not candidate_ballot_no:
                 # Try matching by party within same constituency
                 key2 = (province, cons_no, party_name)
                 candidates_in_cons = candidate_by_party_lookup.get(key2, [])
 
-                for c in candidates_in_cons:
+                for vote62_name, vote62_ballot_no in candidates_in_cons:
                     # Check if names are similar (one contains the other)
-                    vote62_name = c["candidate_name"]
                     if (
                         candidate_name in vote62_name
                         or vote62_name in candidate_name
                         or candidate_name.split()[-1] in vote62_name
                     ):
-                        candidate_ballot_no = c["ballot_no"]
+                        candidate_ballot_no = vote62_ballot_no
                         break
 
             if candidate_ballot_no:
                 matched_candidate += 1
 
-        new_row["candidate_ballot_no"] = candidate_ballot_no
+        row["candidate_ballot_no"] = candidate_ballot_no
 
-        augmented_rows.append(new_row)
+    augmented_rows = constituency_details
 
     print(
         f"  ✓ Matched party numbers: {matched_party:,} / {len(constituency_details):,}"